@@ -20,11 +20,12 @@ from __future__ import annotations
 
 import warnings
 from collections.abc import Mapping, Sequence
-from typing import TYPE_CHECKING, overload, Final, Optional
+from typing import TYPE_CHECKING, cast, overload, Final, Optional
 
 from _delb.exceptions import ParsingValidityError
-from _delb.names import XML_NAMESPACE
+from _delb.names import XML_NAMESPACE, deconstruct_clark_notation
 from _delb.nodes import (
+    _cache_used_namespaces,
     _reduce_whitespace_between_siblings,
     Attribute,
     CommentNode,
@@ -37,12 +38,15 @@ from _delb.parser import Event, EventType, ParserOptions, TagEventData, parse_ev
 from _delb.typing import XMLNodeType
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Collection, Iterator
 
     from _delb.typing import (
         AttributeAccessor,
+        _AttributesData,
+        Filter,
         NodeSource,
         InputStream,
+        QualifiedName,
         TagNodeType,
     )
 
@@ -181,12 +185,101 @@ def tag(*args):  # noqa: C901
 # deserializing streams
 
 
+def _consume_subtree(events: Iterator[Event]):
+    # consumes the events of a started tag's contents up to its end
+    depth = 1
+    for type_, _ in events:
+        if type_ is EventType.TagStart:
+            depth += 1
+        elif type_ is EventType.TagEnd:
+            depth -= 1
+            if not depth:
+                return
+
+
+def _make_tag_matcher(
+    match: str | Collection[str] | Callable[[TagEventData], bool],
+) -> Callable[[TagEventData], bool]:
+    if callable(match):
+        return match
+
+    names = set()
+    for name in (match,) if isinstance(match, str) else match:
+        namespace, local_name = deconstruct_clark_notation(name)
+        names.add((namespace or "", local_name))
+
+    def matches_names(data: TagEventData) -> bool:
+        return (data.namespace, data.local_name) in names
+
+    return matches_names
+
+
+def _remove_text_outside(
+    events: Iterator[Event], match: Callable[[TagEventData], bool]
+) -> Iterator[Event]:
+    # the depth of open tags within a matching subtree
+    depth = 0
+    for event in events:
+        type_, data = event
+        if depth:
+            if type_ is EventType.TagStart:
+                depth += 1
+            elif type_ is EventType.TagEnd:
+                depth -= 1
+        elif type_ is EventType.Text:
+            continue
+        elif type_ is EventType.TagStart:
+            assert isinstance(data, TagEventData)
+            if match(data):
+                depth = 1
+        yield event
+
+
+def _skip_subtrees(
+    events: Iterator[Event], match: Callable[[TagEventData], bool]
+) -> Iterator[Event]:
+    # text that surrounds a skipped subtree is joined to one event, as the parsers emit
+    text: list[str] = []
+    has_root = False
+    for event in events:
+        type_, data = event
+        if type_ is EventType.Text:
+            assert isinstance(data, str)
+            text.append(data)
+            continue
+        if type_ is EventType.TagStart:
+            assert isinstance(data, TagEventData)
+            if match(data):
+                # the matching tag's contents are consumed from the same iterator
+                _consume_subtree(events)
+                continue
+            has_root = True
+        if text:
+            yield EventType.Text, "".join(text)
+            text.clear()
+        yield event
+
+    if text:
+        yield EventType.Text, "".join(text)
+
+    if not has_root:
+        raise ParsingValidityError("The stream contained no root element.")
+
+
 class TreeBuilder:
+    # the namespaces that are used in a tree are mapped to the lowest depth where they
+    # occur. they're re-inserted when a lower one is found, so that a stable sort by
+    # depth yields the order of their first occurrence in a breadth-first traversal.
+    # that is then cached for the serialization of the tree.
+
     __slots__ = (
         "children",
         "event_feed",
+        "names",
+        "namespaces",
         "options",
         "preserve_space",
+        "qualified_names",
         "started_tags",
         "xml_ids",
     )
@@ -194,10 +287,25 @@ class TreeBuilder:
     def __init__(
         self, data: InputStream, parse_options: ParserOptions, base_url: str | None
     ):
+        event_feed = parse_events(data, parse_options, base_url)
+        # events from skipped contents are dropped before any node is created
+        if parse_options.skip_subtrees is not None:
+            event_feed = _skip_subtrees(
+                event_feed, _make_tag_matcher(parse_options.skip_subtrees)
+            )
+        if parse_options.remove_text_outside is not None:
+            event_feed = _remove_text_outside(
+                event_feed, _make_tag_matcher(parse_options.remove_text_outside)
+            )
+
         self.children: Final[list[list[XMLNodeType]]] = []
-        self.event_feed: Final = parse_events(data, parse_options, base_url)
+        self.event_feed: Final = event_feed
+        # equal names and namespaces are shared by all nodes of a parsed stream
+        self.names: Final[dict[str, str]] = {}
+        self.namespaces: Final[dict[str, int]] = {}
         self.options: Final = parse_options
         self.preserve_space: Final[list[bool]] = []
+        self.qualified_names: Final[dict[QualifiedName, QualifiedName]] = {}
         self.started_tags: Final[list[TagNodeType]] = []
         self.xml_ids: Final[set[str]] = set()
 
@@ -224,6 +332,7 @@ class TreeBuilder:
                 result = ProcessingInstructionNode(data[0], data[1])
             case EventType.TagStart:
                 assert isinstance(data, TagEventData)
+                self.check_xml_id(data)
                 self.handle_tag_start(data)
                 result = None
             case EventType.TagEnd:
@@ -240,11 +349,34 @@ class TreeBuilder:
                 assert not self.children
                 assert not self.started_tags
                 assert not self.preserve_space
+                if isinstance(result, TagNode):
+                    self.cache_used_namespaces(result)
                 self.xml_ids.clear()
                 return result
 
         return None
 
+    def check_xml_id(self, data: TagEventData):
+        if (id_ := data.attributes.get((XML_NAMESPACE, "id"))) is not None:
+            if id_ in self.xml_ids:
+                raise ParsingValidityError(f"Redundantly used xml:id: {id_}")
+            else:
+                self.xml_ids.add(id_)
+
+    def cache_used_namespaces(self, node: TagNode):
+        namespaces = self.namespaces
+        _cache_used_namespaces(
+            node, tuple(sorted(namespaces, key=namespaces.__getitem__))
+        )
+        namespaces.clear()
+
+    def collect_namespaces(self, data: TagEventData, depth: int):
+        namespaces = self.namespaces
+        for namespace, _ in ((data.namespace, ""), *data.attributes):
+            if namespaces.get(namespace, depth + 1) > depth:
+                namespaces.pop(namespace, None)
+                namespaces[namespace] = depth
+
     def handle_tag_end(self, data: TagEventData | None) -> TagNodeType:
         result = self.started_tags.pop()
         if __debug__ and data:
@@ -265,19 +397,26 @@ class TreeBuilder:
     def handle_tag_start(self, data):
         assert isinstance(data.namespace, str)
 
-        if (id_ := data.attributes.get((XML_NAMESPACE, "id"))) is not None:
-            if id_ in self.xml_ids:
-                raise ParsingValidityError(f"Redundantly used xml:id: {id_}")
-            else:
-                self.xml_ids.add(id_)
-
+        self.collect_namespaces(data, len(self.started_tags))
         self.children.append([])
 
+        names = self.names
+        attributes: _AttributesData = {}
+        for name, value in data.attributes.items():
+            if (qualified_name := self.qualified_names.get(name)) is None:
+                namespace, local_name = name
+                qualified_name = self.qualified_names[name] = (
+                    names.setdefault(namespace, namespace),
+                    names.setdefault(local_name, local_name),
+                )
+            attributes[qualified_name] = value
+
+        # the parser guarantees well-formed names and contents
         self.started_tags.append(
-            TagNode(
-                local_name=data.local_name,
-                attributes=data.attributes,
-                namespace=data.namespace,
+            TagNode._new_trusted(
+                names.setdefault(data.local_name, data.local_name),
+                names.setdefault(data.namespace, data.namespace),
+                attributes,
             )
         )
 
@@ -309,6 +448,58 @@ class TreeBuilder:
                 self.preserve_space.append(self.preserve_space[-1])
 
 
+class _SubtreesBuilder(TreeBuilder):
+    # nodes are only retained within subtrees whose root is matching, anything else
+    # is dropped as soon as possible. the started tags outside these are kept to
+    # maintain the whitespace handling context.
+
+    __slots__ = ("match", "match_depth")
+
+    def __init__(
+        self,
+        data: InputStream,
+        parse_options: ParserOptions,
+        base_url: str | None,
+        match: Filter,
+    ):
+        super().__init__(data, parse_options, base_url)
+        self.match: Final = match
+        self.match_depth: int | None = None
+
+    def handle_event(self, event: Event) -> XMLNodeType | None:
+        type_, data = event
+
+        match type_:
+            case EventType.TagStart:
+                assert isinstance(data, TagEventData)
+                self.handle_tag_start(data)
+                if self.match_depth is None and self.match(self.started_tags[-1]):
+                    self.match_depth = len(self.started_tags)
+                    self.namespaces.clear()
+                    self.collect_namespaces(data, self.match_depth)
+                if self.match_depth is not None:
+                    # ids are only validated within the matching subtrees
+                    self.check_xml_id(data)
+                return None
+
+            case EventType.TagEnd:
+                assert data is None or isinstance(data, TagEventData)
+                result = self.handle_tag_end(data)
+                if self.match_depth is None:
+                    return None
+                if len(self.started_tags) < self.match_depth:
+                    self.match_depth = None
+                    self.cache_used_namespaces(cast("TagNode", result))
+                    self.xml_ids.clear()
+                    return result
+                self.children[-1].append(result)
+                return None
+
+        if self.match_depth is not None:
+            super().handle_event(event)
+        return None
+
+
 def parse_nodes(
     data: InputStream,
     options: Optional[ParserOptions] = None,
@@ -321,6 +512,58 @@ def parse_nodes(
     yield from TreeBuilder(data, options, base_url)
 
 
+def parse_subtrees(
+    data: InputStream,
+    match: str | Filter,
+    options: Optional[ParserOptions] = None,
+    *,
+    base_url: str | None = None,
+) -> Iterator[TagNodeType]:
+    """
+    Parses the provided input data and yields the (sub-)trees whose root node is
+    matching as soon as these are completely parsed. Any other contents are discarded
+    while parsing, hence the occupied memory is bound to the largest matching subtree
+    rather than to the whole input.
+
+    :param data: The input data.
+    :param match: Either a tag node's universal name (in Clark notation, or a local
+                  name that has no namespace) or a :class:`delb.typing.Filter` that
+                  is applied to every started tag node. Note that filters can only
+                  consider a node's name and attributes as it has no parent and no
+                  child nodes at that point.
+    :param options: The parser's options.
+    :param base_url: The base URL for resolving references.
+
+    Subtrees within matching subtrees are not yielded separately. The yielded nodes
+    have no parent node and the uniqueness of ``xml:id`` attributes is only validated
+    within these. Though the ``lxml`` parser validates it regardless across the whole
+    input.
+
+    >>> for node in parse_subtrees(
+    ...     '<corpus><doc n="1"><p>a</p></doc><info/><doc n="2"/></corpus>', "doc"
+    ... ):
+    ...     print(node)
+    <doc n="1"><p>a</p></doc>
+    <doc n="2"/>
+    """
+    if options is None:
+        options = ParserOptions()
+
+    if isinstance(match, str):
+        namespace, local_name = deconstruct_clark_notation(match)
+        namespace = namespace or ""
+
+        def matches_name(node: XMLNodeType) -> bool:
+            assert isinstance(node, TagNode)
+            return node.local_name == local_name and node.namespace == namespace
+
+        match = matches_name
+
+    yield from cast(
+        "Iterator[TagNodeType]", _SubtreesBuilder(data, options, base_url, match)
+    )
+
+
 def parse_tree(
     data: InputStream,
     options: Optional[ParserOptions] = None,
@@ -338,4 +581,9 @@ def parse_tree(
     return result
 
 
-__all__ = (parse_nodes.__name__, parse_tree.__name__, tag.__name__)
+__all__ = (
+    parse_nodes.__name__,
+    parse_subtrees.__name__,
+    parse_tree.__name__,
+    tag.__name__,
+)
@@ -41,6 +41,43 @@ def _is_tag_or_text_node(node: XMLNodeType) -> bool:
 default_filters: Final[list[tuple[Filter, ...]]] = [(_is_tag_or_text_node,)]
 
 
+def _accept_any_node(node: XMLNodeType) -> bool:
+    return True
+
+
+def _compile_filters(filters: tuple[Filter, ...]) -> Filter:
+    # combines a chain of filters into one predicate that avoids the overhead of
+    # generator expressions per tested node
+    match filters:
+        case ():
+            return _accept_any_node
+        case (filter,):
+            return filter
+        case (first_filter, second_filter):
+
+            def all_of_two(node: XMLNodeType) -> bool:
+                return first_filter(node) and second_filter(node)
+
+            return all_of_two
+        case _:
+
+            def all_of(node: XMLNodeType) -> bool:
+                for filter in filters:  # noqa: SIM111
+                    if not filter(node):
+                        return False
+                return True
+
+            return all_of
+
+
+def _compile_default_filters(filter: tuple[Filter, ...] = ()) -> Filter:
+    # combines the currently active default filters with the given ones
+    if filter:
+        return _compile_filters(default_filters[-1] + filter)
+    else:
+        return _compile_filters(default_filters[-1])
+
+
 @contextmanager
 def altered_default_filters(*filter: Filter, extend: bool = False):
     """
@@ -134,8 +171,10 @@ def not_(*filter: Filter) -> Filter:
     like a boolean ``not``.
     """
 
+    matches = _compile_filters(filter)
+
     def not_wrapper(node: XMLNodeType) -> bool:
-        return not all(f(node) for f in filter)
+        return not matches(node)
 
     return not_wrapper
 
@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import warnings
+from bisect import bisect_left
 from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from itertools import chain
 from typing import (
@@ -28,9 +29,15 @@ from typing import (
     NamedTuple,
     Optional,
 )
+from weakref import WeakKeyDictionary, WeakSet
 
 from _delb.exceptions import AmbiguousTreeError, InvalidCodePath, InvalidOperation
-from _delb.filters import altered_default_filters, default_filters, is_tag_node
+from _delb.filters import (
+    _accept_any_node,
+    altered_default_filters,
+    _compile_default_filters,
+    is_tag_node,
+)
 from _delb.grammar import _is_xml_char, _is_xml_name
 from _delb.names import (
     XML_NAMESPACE,
@@ -38,15 +45,19 @@ from _delb.names import (
     Namespaces,
 )
 from _delb.serializer import (
+    DEFAULT_WRITER_BLOCK_SIZE,
     DefaultStringOptions,
     FormatOptions,
     _StringWriter,
+    _escape_attribute_value,
     _get_serializer,
+    _iterate_serialization,
 )
 from _delb.utils import (
     _StringMixin,
     _crunch_whitespace,
     last,
+    traverse_bf_ltr_ttb,
 )
 from _delb.typing import (
     CommentNodeType,
@@ -59,7 +70,11 @@ from _delb.typing import (
     XMLNodeType,
 )
 from _delb.xpath import QueryResults, _css_to_xpath
-from _delb.xpath import evaluate as evaluate_xpath, parse as parse_xpath
+from _delb.xpath import (
+    evaluate as evaluate_xpath,
+    iterate as iterate_xpath,
+    parse as parse_xpath,
+)
 from _delb.xpath.ast import NameMatchTest, XPathExpression
 
 if TYPE_CHECKING:
@@ -67,6 +82,7 @@ if TYPE_CHECKING:
     from _delb.typing import (
         AttributeAccessor,
         _AttributesData,
+        _EncodedNode,
         Filter,
         NamespaceDeclarations,
         NodeSource,
@@ -199,6 +215,93 @@ def _reduce_whitespace_content(content: str, is_first: bool, is_last: bool) -> s
     return result
 
 
+# compact tree representations
+
+# nodes are encoded as a flat sequence of builtin objects in document order that can be
+# pickled cheaply and without any recursion:
+#   text nodes as their content
+#   comment nodes as one-tuple with the content
+#   processing instruction nodes as tuple of target and content
+#   tag nodes as tuple of namespace, local name, attributes and the number of the
+#     subsequently encoded child nodes
+# as these are obtained from valid trees, no validations are applied when decoding.
+
+
+def _decode_nodes(data: Iterable[_EncodedNode]) -> list[XMLNodeType]:
+    result: list[XMLNodeType] = []
+    # the started tag nodes with the numbers of their child nodes that are yet to come
+    started_tags: list[tuple[TagNode, int]] = []
+    children_count = 0
+
+    for item in data:
+        node: XMLNodeType
+        if isinstance(item, str):
+            node = TextNode(item)
+        elif len(item) == 1:
+            node = CommentNode(item[0])
+        elif len(item) == 2:
+            node = ProcessingInstructionNode(item[0], item[1])
+        else:
+            namespace, local_name, attributes, children_count = item
+            node = TagNode._new_trusted(local_name, namespace, attributes)
+
+        if started_tags:
+            parent, remaining = started_tags.pop()
+            parent._child_nodes.append(node)
+            if remaining > 1:
+                started_tags.append((parent, remaining - 1))
+        else:
+            result.append(node)
+
+        if children_count:
+            assert isinstance(node, TagNode)
+            started_tags.append((node, children_count))
+            children_count = 0
+
+    assert not started_tags
+    return result
+
+
+def _decode_tree(data: Iterable[_EncodedNode]) -> XMLNodeType:
+    (result,) = _decode_nodes(data)
+    return result
+
+
+def _encode_nodes(nodes: Iterable[XMLNodeType]) -> list[_EncodedNode]:
+    # names are deduplicated so that pickle refers to repeated ones by memo
+    names: dict[Any, Any] = {}
+    result: list[_EncodedNode] = []
+
+    for root in nodes:
+        for node in chain((root,), root._iterate_descendants()):
+            match node:
+                case TextNode():
+                    result.append(node.content)
+                case CommentNode():
+                    result.append((node.content,))
+                case ProcessingInstructionNode():
+                    result.append(
+                        (names.setdefault(node.target, node.target), node.content)
+                    )
+                case TagNode():
+                    result.append(
+                        (
+                            names.setdefault(node.namespace, node.namespace),
+                            names.setdefault(node.local_name, node.local_name),
+                            {
+                                names.setdefault(n, n): v
+                                for n, v in node.attributes._as_data().items()
+                            }
+                            or None,
+                            len(node._child_nodes),
+                        )
+                    )
+                case _:
+                    raise InvalidCodePath
+
+    return result
+
+
 # abstract tag definitions
 
 
@@ -240,6 +343,17 @@ class Attribute(_StringMixin):
     def __str__(self):
         return self.__value
 
+    @classmethod
+    def _new_trusted(
+        cls, qualified_name: QualifiedName, value: str, attributes: TagAttributes
+    ) -> Attribute:
+        # skips the validation of data that is known to be valid
+        result = cls.__new__(cls)
+        result._attributes = attributes
+        result.__qualified_name = qualified_name
+        result.__value = value
+        return result
+
     def __set_new_key(self, namespace: str, name: str):
         assert self.__qualified_name != (namespace, name)
 
@@ -297,7 +411,15 @@ class Attribute(_StringMixin):
             raise TypeError
         if value and not _is_xml_char(value):
             raise ValueError("Invalid XML character data.")
+        if (
+            _indexed_document_nodes
+            and self._attributes is not None
+            and self.__qualified_name == (XML_NAMESPACE, "id")
+        ):
+            self._attributes._handle_xml_id_change(self.value, value)
         self.__value = value
+        if self._attributes is not None:
+            self._attributes._escaped_items = None
 
 
 class TagAttributes(MutableMapping):
@@ -307,6 +429,7 @@ class TagAttributes(MutableMapping):
 
     __slots__ = (
         "__data",
+        "_escaped_items",
         "__node",
     )
 
@@ -319,6 +442,8 @@ class TagAttributes(MutableMapping):
             raise TypeError
 
         self.__data: dict[QualifiedName, Attribute] = {}
+        # the serializers' rendition of the sorted attributes, dropped on alterations
+        self._escaped_items: Optional[tuple[tuple[str, str, str], ...]] = None
         self.__node = node
         self.update(data)
 
@@ -327,8 +452,14 @@ class TagAttributes(MutableMapping):
 
     def __delitem__(self, item: AttributeAccessor):
         name = self.__resolve_accessor(item)
-        self.__data[name]._attributes = None
+        attribute = self.__data[name]
+        if _indexed_document_nodes and name == (XML_NAMESPACE, "id"):
+            self._handle_xml_id_change(attribute.value, None)
+        attribute._attributes = None
         del self.__data[name]
+        self._escaped_items = None
+        if _namespace_usages:
+            _invalidate_namespace_usages(self.__node)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Mapping):
@@ -366,8 +497,17 @@ class TagAttributes(MutableMapping):
                 raise TypeError
 
         assert attribute._attributes in (self, None)
+        if _indexed_document_nodes and name == (XML_NAMESPACE, "id"):
+            self._handle_xml_id_change(
+                None if (current := self.__data.get(name)) is None else current.value,
+                attribute.value,
+            )
         attribute._attributes = self
+        # only a new name may add a namespace to the tree's usage
+        if _namespace_usages and name not in self.__data:
+            _invalidate_namespace_usages(self.__node)
         self.__data[name] = attribute
+        self._escaped_items = None
 
     def __str__(self):
         return str(self.as_dict_with_strings())
@@ -392,6 +532,36 @@ class TagAttributes(MutableMapping):
         """Returns the attributes as :class:`str` instances in a :class:`dict`."""
         return {a.universal_name: a.value for a in self.values()}
 
+    def _as_data(self) -> _AttributesData:
+        return {name: attribute.value for name, attribute in self.__data.items()}
+
+    def _get_escaped_items(self) -> tuple[tuple[str, str, str], ...]:
+        # returns the namespace, local name and escaped, quoted value of each attribute
+        # in the order of their names
+        if (result := self._escaped_items) is None:
+            data = self.__data
+            result = self._escaped_items = tuple(
+                (*name, f'"{_escape_attribute_value(data[name].value)}"')
+                for name in sorted(data)
+            )
+        return result
+
+    @classmethod
+    def _new_trusted(cls, data: _AttributesData, node: TagNode) -> TagAttributes:
+        # skips the validation of data that is known to be valid
+        result = cls.__new__(cls)
+        result.__data = {
+            name: Attribute._new_trusted(name, value, result)
+            for name, value in data.items()
+        }
+        result._escaped_items = None
+        result.__node = node
+        return result
+
+    def _handle_xml_id_change(self, old: Optional[str], new: Optional[str]):
+        assert isinstance(self.__node, TagNode)
+        _index_xml_id_change(self.__node, old, new)
+
 
 # containers
 
@@ -402,9 +572,15 @@ class Siblings:
     Everyone's taken care of.
     """
 
+    # the nodes' positions are cached in their _sibling_index attribute, these are
+    # guaranteed to be correct for the first __indexed_nodes items in __data. hence
+    # insertions and removals only invalidate positions from their index on and these
+    # are lazily refreshed on demand.
+
     __slots__ = (
         "__belongs_to",
         "__data",
+        "__indexed_nodes",
     )
 
     def __init__(
@@ -414,9 +590,10 @@ class Siblings:
     ):
         self.__data: Final[list[XMLNodeType]] = []
         self.__belongs_to: Final = belongs_to
+        self.__indexed_nodes = 0
         if nodes is not None:
             for node in nodes:
-                self.__data.append(self._handle_new_sibling(node))
+                self.append(node)
 
     @overload
     def __getitem__(self, index: int) -> XMLNodeType:
@@ -440,16 +617,37 @@ class Siblings:
 
     def append(self, node: NodeSource) -> XMLNodeType:
         result = self._handle_new_sibling(node)
-        self.__data.append(result)
+        data = self.__data
+        if self.__indexed_nodes == len(data):
+            result._sibling_index = self.__indexed_nodes
+            self.__indexed_nodes += 1
+        data.append(result)
+        if _indexed_document_nodes:
+            _index_attached_node(self.__belongs_to, result)
         return result
 
     def clear(self):
+        if _namespace_usages and any(isinstance(n, TagNode) for n in self.__data):
+            _invalidate_namespace_usages(self.__belongs_to)
+        if _indexed_document_nodes:
+            for node in self.__data:
+                _index_detached_node(self.__belongs_to, node)
         for node in self.__data:
             node._parent = None
         self.__data.clear()
+        self.__indexed_nodes = 0
 
     def index(self, node: XMLNodeType) -> int:
-        for result, n in enumerate(self.__data):
+        data = self.__data
+        indexed_nodes = self.__indexed_nodes
+
+        if (result := node._sibling_index) < indexed_nodes and data[result] is node:
+            return result
+
+        for result in range(indexed_nodes, len(data)):
+            n = data[result]
+            n._sibling_index = result
+            self.__indexed_nodes = result + 1
             if n is node:
                 return result
         else:
@@ -457,12 +655,31 @@ class Siblings:
 
     def insert(self, index: int, node: NodeSource) -> XMLNodeType:
         result = self._handle_new_sibling(node)
-        self.__data.insert(index, result)
+        data = self.__data
+
+        if index < 0:
+            index = max(0, len(data) + index)
+        else:
+            index = min(index, len(data))
+
+        if self.__indexed_nodes >= index:
+            result._sibling_index = index
+            self.__indexed_nodes = index + 1
+
+        data.insert(index, result)
+        if _indexed_document_nodes:
+            _index_attached_node(self.__belongs_to, result)
         return result
 
     def remove(self, node: XMLNodeType):
+        if _namespace_usages and isinstance(node, TagNode):
+            _invalidate_namespace_usages(self.__belongs_to)
+        index = self.index(node)
+        if _indexed_document_nodes:
+            _index_detached_node(self.__belongs_to, node)
         node._parent = None
-        del self.__data[self.index(node)]
+        del self.__data[index]
+        self.__indexed_nodes = min(self.__indexed_nodes, index)
 
     def _handle_new_sibling(self, node: NodeSource) -> XMLNodeType:
         if isinstance(self.__belongs_to, _DocumentNode):
@@ -472,6 +689,9 @@ class Siblings:
                 isinstance(n, TagNode) for n in self.__data
             ):
                 raise InvalidCodePath
+        elif _namespace_usages and isinstance(node, (TagNode, _TagDefinition)):
+            # other nodes than tag nodes don't affect the namespace usage
+            _invalidate_namespace_usages(self.__belongs_to)
 
         match node:
             case str():
@@ -496,15 +716,204 @@ class Siblings:
         return node
 
 
+# namespace usages
+
+# the namespaces that are used within the subtrees of tag nodes. as long as there are
+# none, the maintenance hooks are skipped entirely.
+_namespace_usages: Final[WeakKeyDictionary[TagNode, tuple[str, ...]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _cache_used_namespaces(node: TagNode, namespaces: tuple[str, ...]):
+    _namespace_usages[node] = namespaces
+
+
+def _invalidate_namespace_usages(node: None | ParentNodeType):
+    # an alteration of a subtree may change the namespace usage of all its ancestors,
+    # other trees are unaffected
+    while isinstance(node, TagNode):
+        _namespace_usages.pop(node, None)
+        node = node._parent
+
+
+# indexes
+
+# the document nodes that hold any index. as long as there are none, the maintenance
+# hooks are skipped entirely.
+_indexed_document_nodes: Final[WeakSet[_DocumentNode]] = WeakSet()
+
+
+def _get_indexing_document_node(node: None | XMLNodeType) -> Optional[_DocumentNode]:
+    if node is None:
+        return None
+    while (parent := node._parent) is not None:
+        node = parent
+    if isinstance(node, _DocumentNode) and node in _indexed_document_nodes:
+        return node
+    return None
+
+
+def _get_xml_id(node: TagNode) -> Optional[str]:
+    if (attribute := node.attributes.get((XML_NAMESPACE, "id"))) is None:
+        return None
+    return attribute.value
+
+
+def _get_xml_id_index(document_node: _DocumentNode) -> dict[str, list[TagNode]]:
+    # ids are mapped to all nodes that carry them, redundant assignments are kept so
+    # that the remaining nodes are still found when one of them is resolved
+    if (xml_ids := document_node._xml_ids) is None:
+        xml_ids = document_node._xml_ids = {}
+        for node in document_node._iterate_descendants():
+            if isinstance(node, TagNode) and (value := _get_xml_id(node)) is not None:
+                xml_ids.setdefault(value, []).append(node)
+        _indexed_document_nodes.add(document_node)
+    return xml_ids
+
+
+def _index_attached_node(parent: None | _ParentNode, node: XMLNodeType):
+    if (document_node := _get_indexing_document_node(parent)) is None:
+        return
+    if document_node._name_index is not None:
+        document_node._name_index.invalidate()
+    if (xml_ids := document_node._xml_ids) is not None:
+        for tag_node in _iterate_tag_nodes_in_subtree(node):
+            if (value := _get_xml_id(tag_node)) is not None:
+                xml_ids.setdefault(value, []).append(tag_node)
+
+
+def _index_detached_node(parent: None | _ParentNode, node: XMLNodeType):
+    if (document_node := _get_indexing_document_node(parent)) is None:
+        return
+    if document_node._name_index is not None:
+        document_node._name_index.invalidate()
+    if (xml_ids := document_node._xml_ids) is not None:
+        for tag_node in _iterate_tag_nodes_in_subtree(node):
+            if (value := _get_xml_id(tag_node)) is not None:
+                _unindex_xml_id(xml_ids, value, tag_node)
+
+
+def _index_xml_id_change(node: TagNode, old: Optional[str], new: Optional[str]):
+    if (document_node := _get_indexing_document_node(node)) is None or (
+        xml_ids := document_node._xml_ids
+    ) is None:
+        return
+    if old is not None:
+        _unindex_xml_id(xml_ids, old, node)
+    if new is not None:
+        xml_ids.setdefault(new, []).append(node)
+
+
+def _unindex_xml_id(xml_ids: dict[str, list[TagNode]], value: str, node: TagNode):
+    if (nodes := xml_ids.get(value)) is None:
+        return
+    for i, candidate in enumerate(nodes):
+        if candidate is node:
+            del nodes[i]
+            break
+    if not nodes:
+        del xml_ids[value]
+
+
+def _invalidate_name_index(node: XMLNodeType):
+    if (
+        document_node := _get_indexing_document_node(node)
+    ) is not None and document_node._name_index is not None:
+        document_node._name_index.invalidate()
+
+
+def _iterate_tag_nodes_in_subtree(node: XMLNodeType) -> Iterator[TagNode]:
+    if isinstance(node, TagNode):
+        yield node
+        for descendant in node._iterate_descendants():
+            if isinstance(descendant, TagNode):
+                yield descendant
+
+
+class _NameIndex:
+    """
+    Maps the names of a document's tag nodes to these in document order. Each tag node's
+    span of descendants is recorded as well so that the matching descendants of any
+    node can be sliced from these lists. The index is built on demand and dropped with
+    any alteration of the tree's structure or of tag names.
+    """
+
+    __slots__ = ("__document_node", "__entries", "__spans")
+
+    def __init__(self, document_node: _DocumentNode):
+        self.__document_node: Final = document_node
+        self.__entries: Optional[
+            dict[tuple[str, str], tuple[list[TagNode], list[int]]]
+        ] = None
+        # maps node ids to the range of positions that a node and its descendants take
+        self.__spans: dict[int, tuple[int, int]] = {}
+
+    def __build(self) -> dict[tuple[str, str], tuple[list[TagNode], list[int]]]:
+        entries: dict[tuple[str, str], tuple[list[TagNode], list[int]]] = {}
+        spans = self.__spans
+        position = 0
+
+        # the document node itself takes no position
+        stack: list[tuple[_ParentNode, int, Iterator[XMLNodeType]]] = [
+            (self.__document_node, -1, iter(self.__document_node._child_nodes))
+        ]
+        while stack:
+            parent, start, children = stack[-1]
+            for node in children:
+                if isinstance(node, TagNode):
+                    nodes, positions = entries.setdefault(
+                        (node.namespace, node.local_name), ([], [])
+                    )
+                    nodes.append(node)
+                    positions.append(position)
+                    stack.append((node, position, iter(node._child_nodes)))
+                    position += 1
+                    break
+            else:
+                stack.pop()
+                spans[id(parent)] = (start, position)
+
+        self.__entries = entries
+        return entries
+
+    def descendants(
+        self, node: XMLNodeType, namespace: str, local_name: str, include_self: bool
+    ) -> list[TagNode]:
+        """
+        Returns the tag nodes with the given name among a node's descendants in
+        document order.
+        """
+        if (entries := self.__entries) is None:
+            entries = self.__build()
+
+        if (entry := entries.get((namespace, local_name))) is None:
+            return []
+        nodes, positions = entry
+
+        if (span := self.__spans.get(id(node))) is None:
+            # not a tag node
+            return []
+        start, end = span
+        if not include_self:
+            start += 1
+        return nodes[bisect_left(positions, start) : bisect_left(positions, end)]
+
+    def invalidate(self):
+        self.__entries = None
+        self.__spans = {}
+
+
 # nodes
 
 
 class _NodeCommons(XMLNodeType):
 
-    __slots__ = ("_parent",)
+    __slots__ = ("_parent", "_sibling_index")
 
     def __init__(self):
         self._parent = None
+        self._sibling_index = 0
 
     def __copy__(self):
         return self.clone(deep=False)
@@ -512,6 +921,10 @@ class _NodeCommons(XMLNodeType):
     def __deepcopy__(self, memo):
         return self.clone(deep=True)
 
+    def __reduce__(self):
+        # a node is pickled as detached copy of its subtree
+        return _decode_tree, (_encode_nodes((self,)),)
+
     def __str__(self) -> str:
         return self.serialize(
             format_options=DefaultStringOptions.format_options,
@@ -561,9 +974,9 @@ class _NodeCommons(XMLNodeType):
         return self
 
     def fetch_following(self, *filter: Filter) -> Optional[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_following():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 return node
         else:
             return None
@@ -575,9 +988,9 @@ class _NodeCommons(XMLNodeType):
             return None
 
     def fetch_following_sibling(self, *filter: Filter) -> Optional[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_following_siblings():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 return node
         else:
             return None
@@ -590,9 +1003,9 @@ class _NodeCommons(XMLNodeType):
         return siblings[siblings.index(self) + 1]
 
     def fetch_preceding(self, *filter: Filter) -> Optional[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_preceding():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 return node
         else:
             return None
@@ -604,9 +1017,9 @@ class _NodeCommons(XMLNodeType):
             return None
 
     def fetch_preceding_sibling(self, *filter: Filter) -> Optional[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_preceding_siblings():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 return node
         else:
             return None
@@ -622,20 +1035,20 @@ class _NodeCommons(XMLNodeType):
     @property
     def index(self) -> Optional[int]:
         if self._parent is not None:
-            for result, node in enumerate(
-                n
-                for n in self._parent._child_nodes
-                if all(f(n) for f in default_filters[-1])
-            ):
-                if node is self:
-                    return result
+            matches = _compile_default_filters()
+            result = 0
+            for node in self._parent._child_nodes:
+                if matches(node):
+                    if node is self:
+                        return result
+                    result += 1
 
         return None
 
     def iterate_ancestors(self, *filter: Filter) -> Iterator[ParentNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_ancestors():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_ancestors(
@@ -656,9 +1069,9 @@ class _NodeCommons(XMLNodeType):
     def iterate_following(
         self, *filter: Filter, include_descendants: bool = True
     ) -> Iterator[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_following(include_descendants=include_descendants):
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_following(
@@ -688,9 +1101,9 @@ class _NodeCommons(XMLNodeType):
         )
 
     def iterate_following_siblings(self, *filter: Filter) -> Iterator[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_following_siblings():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_following_siblings(self) -> Iterator[XMLNodeType]:
@@ -704,9 +1117,9 @@ class _NodeCommons(XMLNodeType):
     def iterate_preceding(
         self, *filter: Filter, include_ancestors: bool = True
     ) -> Iterator[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_preceding(include_ancestors=include_ancestors):
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_preceding(
@@ -726,9 +1139,9 @@ class _NodeCommons(XMLNodeType):
         yield from parent._iterate_preceding(include_ancestors=include_ancestors)
 
     def iterate_preceding_siblings(self, *filter: Filter) -> Iterator[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_preceding_siblings():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_preceding_siblings(self) -> Iterator[XMLNodeType]:
@@ -739,6 +1152,13 @@ class _NodeCommons(XMLNodeType):
         for index in range(siblings.index(self) - 1, -1, -1):
             yield siblings[index]
 
+    def iterate_xpath(
+        self,
+        expression: str,
+        namespaces: Optional[NamespaceDeclarations] = None,
+    ) -> Iterator[XMLNodeType]:
+        return iterate_xpath(node=self, expression=expression, namespaces=namespaces)
+
     def _iterate_reversed_descendants(self) -> Iterator[XMLNodeType]:
         if not isinstance(self, TagNode) or not self._child_nodes:
             yield self
@@ -861,9 +1281,12 @@ class _ParentNode(_NodeCommons, ParentNodeType):
         self._child_nodes = Siblings(nodes=children, belongs_to=self)
 
     def __len__(self) -> int:
+        if (matches := _compile_default_filters()) is _accept_any_node:
+            return len(self._child_nodes)
+
         result = 0
         for node in self._child_nodes:
-            if all(f(node) for f in default_filters[-1]):
+            if matches(node):
                 result += 1
 
         return result
@@ -885,8 +1308,9 @@ class _ParentNode(_NodeCommons, ParentNodeType):
 
     @property
     def first_child(self) -> Optional[XMLNodeType]:
+        matches = _compile_default_filters()
         for node in self._child_nodes:
-            if all(f(node) for f in default_filters[-1]):
+            if matches(node):
                 return node
         else:
             return None
@@ -912,18 +1336,18 @@ class _ParentNode(_NodeCommons, ParentNodeType):
         return tuple(result)
 
     def iterate_children(self, *filter: Filter) -> Iterator[XMLNodeType]:
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._child_nodes:
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def iterate_descendants(self, *filter: Filter) -> Iterator[XMLNodeType]:
         if not self._child_nodes:
             return
 
-        all_filters = default_filters[-1] + filter
+        matches = _compile_default_filters(filter)
         for node in self._iterate_descendants():
-            if all(f(node) for f in all_filters):
+            if matches(node):
                 yield node
 
     def _iterate_descendants(self) -> Iterator[XMLNodeType]:
@@ -943,16 +1367,17 @@ class _ParentNode(_NodeCommons, ParentNodeType):
     @property
     def last_child(self) -> Optional[XMLNodeType]:
         if self._child_nodes:
-            filters = default_filters[-1]
+            matches = _compile_default_filters()
             for node in self._child_nodes[::-1]:
-                if all(f(node) for f in filters):
+                if matches(node):
                     return node
         return None
 
     @property
     def last_descendant(self) -> Optional[XMLNodeType]:
+        matches = _compile_default_filters()
         for node in self._iterate_reversed_descendants():
-            if node is not self and all(f(node) for f in default_filters[-1]):
+            if node is not self and matches(node):
                 return node
         else:
             return None
@@ -1038,9 +1463,11 @@ class _DocumentNode(_ParentNode, _DocumentNodeType):
     :class:`Document` instance.
     """
 
-    __slots__ = ("__document",)
+    __slots__ = ("__document", "_name_index", "_xml_ids")
 
     def __init__(self, document: Document | None, children: Iterable[XMLNodeType]):
+        self._name_index: Optional[_NameIndex] = None
+        self._xml_ids: Optional[dict[str, list[TagNode]]] = None
         super().__init__(children)
         self.__document: Final = document
 
@@ -1181,6 +1608,8 @@ class TagNode(_ParentNode, TagNodeType):
     >>> print(deepcopy(root))
     <root>Content</root>
 
+    Pickled nodes are restored as detached copies of their subtree.
+
     Attribute values and child nodes can be obtained, set and deleted with the subscript
     notation.
 
@@ -1221,6 +1650,8 @@ class TagNode(_ParentNode, TagNodeType):
         namespace: Optional[str] = None,
         children: Iterable[NodeSource] = (),
     ):
+        # the name setters refer to it
+        self._parent = None
         self.namespace = namespace or ""
         self.local_name = local_name
         self.__attributes = TagAttributes(data=attributes or {}, node=self)
@@ -1395,10 +1826,8 @@ class TagNode(_ParentNode, TagNodeType):
         return self.__attributes
 
     def clone(self, deep: bool = False) -> TagNodeType:
-        result = TagNode(
-            local_name=self.__local_name,
-            namespace=self.__namespace,
-            attributes=self.attributes,
+        result = TagNode._new_trusted(
+            self.__local_name, self.__namespace, self.__attributes._as_data()
         )
         if deep:
             result.append_children(*(n.clone(deep=True) for n in self._child_nodes))
@@ -1468,16 +1897,15 @@ class TagNode(_ParentNode, TagNodeType):
                 "The XPath expression doesn't determine a distinct branch."
             )
 
-        query_result = self.xpath(expression, namespaces=namespaces)
-
-        if query_result.size == 1:
-            result = query_result.first
-            assert isinstance(result, TagNode)
-            return result
+        results = self.iterate_xpath(expression, namespaces=namespaces)
 
-        if query_result:
+        if (result := next(results, None)) is not None:
+            if next(results, None) is None:
+                assert isinstance(result, TagNode)
+                return result
             raise AmbiguousTreeError(
-                f"The tree already contains {query_result.size} matching branches."
+                f"The tree already contains {2 + sum(1 for _ in results)} matching "
+                "branches."
             )
 
         return self._create_by_xpath(
@@ -1535,6 +1963,22 @@ class TagNode(_ParentNode, TagNodeType):
         assert isinstance(node, TagNode)
         return node
 
+    def _get_used_namespaces(self) -> tuple[str, ...]:
+        # returns the namespaces of the tag nodes and attributes within the subtree in
+        # the order of their first occurrence in a breadth-first traversal
+        if (usage := _namespace_usages.get(self)) is not None:
+            return usage
+
+        result: dict[str, None] = {}
+        for node in traverse_bf_ltr_ttb(self, is_tag_node):
+            assert isinstance(node, TagNode)
+            result[node.__namespace] = None
+            for namespace, _ in node.attributes:
+                result[namespace] = None
+
+        _cache_used_namespaces(self, namespaces := tuple(result))
+        return namespaces
+
     def _get_normalize_space_directive(
         self, default: Literal["default", "preserve"] = "default"
     ) -> Literal["default", "preserve"]:
@@ -1563,19 +2007,49 @@ class TagNode(_ParentNode, TagNodeType):
             case str():
                 if not _is_xml_name(value):
                     raise ValueError("Value is not a valid xml name.")
-                root = cast("TagNode", last(self._iterate_ancestors())) or self
-                for node in chain((root,), root._iterate_descendants()):
-                    if not isinstance(node, TagNode):
-                        continue
-                    if node.attributes.get((XML_NAMESPACE, "id"), "") == value:
-                        raise ValueError(
-                            "An xml:id-attribute with that value is already assigned "
-                            "in the tree."
-                        )
+
+                root: XMLNodeType = self
+                while (parent := root._parent) is not None:
+                    root = parent
+                if isinstance(root, _DocumentNode):
+                    is_assigned = value in _get_xml_id_index(root)
+                else:
+                    is_assigned = any(
+                        _get_xml_id(n) == value
+                        for n in _iterate_tag_nodes_in_subtree(root)
+                    )
+                if is_assigned:
+                    raise ValueError(
+                        "An xml:id-attribute with that value is already assigned "
+                        "in the tree."
+                    )
+
                 self.attributes[(XML_NAMESPACE, "id")] = value
             case _:
                 raise TypeError("Value must be None or a string.")
 
+    def iter_serialize(
+        self,
+        *,
+        chunk_size: int = DEFAULT_WRITER_BLOCK_SIZE,
+        encoding: str = "utf-8",
+        format_options: Optional[FormatOptions] = None,
+        namespaces: Optional[NamespaceDeclarations] = None,
+        newline: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        def serialize(serializer):
+            serializer.serialize_root(self)
+            serializer.writer.flush()
+
+        return _iterate_serialization(
+            serialize,
+            chunk_size=chunk_size,
+            encoding=encoding,
+            format_options=format_options,
+            namespaces=namespaces,
+            newline=newline,
+        )
+
     @property
     def local_name(self) -> str:
 
@@ -1586,6 +2060,8 @@ class TagNode(_ParentNode, TagNodeType):
         if not _is_xml_name(value):
             raise ValueError("Value is not a valid xml name.")
         self.__local_name = value
+        if _indexed_document_nodes:
+            _invalidate_name_index(self)
 
     @property
     def location_path(self) -> str:
@@ -1614,6 +2090,27 @@ class TagNode(_ParentNode, TagNodeType):
         if value and not _is_xml_char(value):
             raise ValueError("Invalid XML character data.")
         self.__namespace = value
+        if _namespace_usages:
+            _invalidate_namespace_usages(self)
+        if _indexed_document_nodes:
+            _invalidate_name_index(self)
+
+    @classmethod
+    def _new_trusted(
+        cls,
+        local_name: str,
+        namespace: str,
+        attributes: Optional[_AttributesData],
+    ) -> TagNode:
+        # skips the validation of data that is known to be valid
+        result = cls.__new__(cls)
+        result._parent = None
+        result._sibling_index = 0
+        result.__local_name = local_name
+        result.__namespace = namespace
+        result.__attributes = TagAttributes._new_trusted(attributes or {}, result)
+        result._child_nodes = Siblings(belongs_to=result, nodes=None)
+        return result
 
     def _new_tag_node_from_definition(self, definition: _TagDefinition) -> TagNode:
         return TagNode(
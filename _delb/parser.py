@@ -25,7 +25,7 @@ from typing import Final, TYPE_CHECKING, NamedTuple, Optional, TypeAlias, cast
 from _delb.plugins import plugin_manager
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Callable, Collection, Iterator, Sequence
 
     from _delb.plugins import XMLEventParserInterface
     from _delb.typing import BinaryReader, InputStream, _AttributesData
@@ -81,26 +81,29 @@ class ParserOptions(NamedTuple):
     The configuration options that define an XML parser's behaviour.
 
     The used parser backend is determined by their availability and the
-    ``preferred_parsers`` setting.  *delb* comes with two contributed implementations
+    ``preferred_parsers`` setting.  *delb* comes with four contributed implementations
     and further can be added to the plugin manager based on
     :class:`_delb.plugins.XMLEventParserInterface`.
 
-    Both contributed implementations should not be tasked with documents that refer
-    invalid *Document Type Declarations* (DTDs), such may pass when their included
-    character entity declarations aren't used in the character data of the document or
-    lead to errors of different degrees of severity.  Character entity declarations are
-    the only considered DTD feature to provide backward compatibility.
+    The ``expat``, ``pyexpat`` and ``lxml`` based implementations should not be tasked
+    with documents that refer invalid *Document Type Declarations* (DTDs), such may
+    pass when their included character entity declarations aren't used in the
+    character data of the document or lead to errors of different degrees of severity.
+    Character entity declarations are the only considered DTD feature to provide
+    backward compatibility.
 
-    Both will not allow some non-word characters as part of XML names that should be
-    allowed with the 5th edition of the XML 1.0 specification, e.g. ``:`` or single
-    combining characters.
+    These three will not allow some non-word characters as part of XML names that
+    should be allowed with the 5th edition of the XML 1.0 specification, e.g. ``:`` or
+    single combining characters.
 
     Beside the :exc:`_delb.exceptions.ParsingError` exception and its derivations the
     employed parsers may evoke their specific exceptions when confronted with invalid
     syntax and not-so-well-formed documents.
 
     The ``expat`` parser adapter depends on the :mod:`xml.sax.expatreader` module from
-    the standard library that is available with many Python distributions.
+    the standard library that is available with many Python distributions.  The
+    ``pyexpat`` adapter uses the same backend through its immediate interface
+    :mod:`xml.parsers.expat` with less overhead and should generally be preferred.
 
     The ``lxml`` based parser requires the *lxml* package to be present in the
     interpreter environment.  This parser is prone to crashing when processing invalid
@@ -108,8 +111,20 @@ class ParserOptions(NamedTuple):
     should not be used with other encodings than Unicode to avoid crashes. Neither
     should it be used in conjunction with the `load_referenced_resources` when
     processing larger files / trees.
+
+    The ``native`` parser is implemented in pure Python and is always available.  It
+    doesn't support DTDs at all, these are skipped and any reference to an entity other
+    than the predefined ones is refused.  Hence the ``load_referenced_resources``
+    option has no effect with it.
     """  # noqa: RST304
 
+    chunk_size: int = 2**16
+    """
+    The size of the chunks in which an input stream is read and fed to the parser.
+    Parser events are emitted after each chunk, so that this value, rather than the
+    input's size, determines the memory that is occupied by unprocessed input data.
+    It must be a positive number.  Default: ``65536``.
+    """
     encoding: Optional[str] = None
     """
     This should be used for streams where the encoding is not noted in an XML document
@@ -134,6 +149,22 @@ class ParserOptions(NamedTuple):
     """
     Don't include processing instructions in the parsed tree.  Default: :obj:`False`.
     """
+    remove_text_outside: (
+        None | str | Collection[str] | Callable[[TagEventData], bool]
+    ) = None
+    """
+    Only retain text nodes within subtrees whose root tag is matching.  Tags can be
+    matched by one or more universal names (in Clark notation, or local names that
+    have no namespace) or by a predicate that is called with each started tag's
+    :class:`TagEventData`.  Note that predicates can't be passed to
+    :func:`delb.load_documents` if they can't be pickled.  Default: :obj:`None`.
+    """
+    skip_subtrees: None | str | Collection[str] | Callable[[TagEventData], bool] = None
+    """
+    Drop the subtrees whose root tag is matching without building any nodes from
+    them.  Tags are matched as with ``remove_text_outside``, which is applied to the
+    remaining contents.  Default: :obj:`None`.
+    """
     unplugged: bool = False
     """Don't load referenced resources over network.  Default: :obj:`False`."""
 
@@ -194,6 +225,10 @@ def detect_encoding(stream: bytes) -> str | None:
 def _make_parser(
     options: ParserOptions, *, base_url: str | None, encoding: str
 ) -> XMLEventParserInterface:
+    if options.chunk_size < 1:
+        raise ValueError(
+            f"The chunk_size parser option must be positive, got {options.chunk_size}."
+        )
     return plugin_manager.get_parser(options.preferred_parsers)(
         options, base_url=base_url, encoding=encoding
     )
@@ -134,7 +134,9 @@ class PluginManager:
         if find_spec("lxml"):
             import _delb.plugins.lxml_parser
         if find_spec("pyexpat"):
-            import _delb.plugins.expat_parser  # noqa: F401
+            import _delb.plugins.expat_parser
+            import _delb.plugins.pyexpat_parser
+        import _delb.plugins.native_parser  # noqa: F401
 
         for entrypoint in entry_points().select(group="delb"):
             entrypoint.load()
@@ -189,13 +189,18 @@ class ExpatParser(XMLEventParserInterface):
         return parser
 
     def parse(self, data: BinaryReader | str) -> Iterator[Event]:
+        chunk_size = self.options.chunk_size
+
         if isinstance(data, str):
-            self.parser.feed(data)
+            # an empty string is fed as well, the parser wouldn't complain otherwise
+            for index in range(0, max(len(data), 1), chunk_size):
+                self.parser.feed(data[index : index + chunk_size])
+                yield from self.emit_events()
         else:
             decoder = codecs.getincrementaldecoder(self.encoding)()
-            while chunk := data.read():
+            while chunk := data.read(chunk_size):
                 self.parser.feed(decoder.decode(chunk))
-            yield from self.emit_events()
+                yield from self.emit_events()
             self.parser.feed(decoder.decode(b"", final=True))
 
         self.parser.close()
@@ -32,7 +32,7 @@ if TYPE_CHECKING:
 
 
 class LxmlParser(XMLEventParserInterface):
-    __slots__ = ("parser",)
+    __slots__ = ("child_counts", "chunk_size", "parser")
 
     name = "lxml"
 
@@ -48,6 +48,10 @@ class LxmlParser(XMLEventParserInterface):
                 category=UserWarning,
             )
 
+        # the number of child nodes that were started per open element, the first
+        # item counts the ones on the document level
+        self.child_counts = [0]
+        self.chunk_size = options.chunk_size
         self.parser = etree.XMLPullParser(
             base_url=base_url,
             dtd_validation=False,
@@ -68,15 +72,25 @@ class LxmlParser(XMLEventParserInterface):
             yield from self.handle_event(event)
 
     def handle_element_preceding_text(self, element: etree._Element):
-        if ((parent := element.getparent()) is not None) and (
-            parent.index(element) == 0
-        ):
+        # processed elements are removed from the tree to free their memory, hence an
+        # element has no more than one preceding sibling
+        child_counts = self.child_counts
+        if (parent := element.getparent()) is None:
+            if (previous := element.getprevious()) is not None:
+                if previous.tail:
+                    yield EventType.Text, previous.tail
+                previous.clear()
+        elif child_counts[-1] == 0:
             if parent.text:
                 yield EventType.Text, parent.text
-        elif (previous := element.getprevious()) is not None:
+                parent.text = None
+        else:
+            previous = element.getprevious()
+            assert previous is not None
             if previous.tail:
                 yield EventType.Text, previous.tail
-            previous.clear()
+            parent.remove(previous)
+        child_counts[-1] += 1
 
     def handle_event(self, event: etree._ParseEvent) -> Iterator[Event]:
         action, element = event
@@ -91,10 +105,11 @@ class LxmlParser(XMLEventParserInterface):
                 text = element.text or ""
                 yield EventType.Comment, text
             case "end":
-                if len(element):
-                    if element[-1].tail:
-                        yield EventType.Text, element[-1].tail
-                        element[-1].tail = None
+                if self.child_counts.pop():
+                    last_child = element[-1]
+                    if last_child.tail:
+                        yield EventType.Text, last_child.tail
+                    element.remove(last_child)
                 else:
                     if element.text:
                         yield EventType.Text, element.text
@@ -106,13 +121,18 @@ class LxmlParser(XMLEventParserInterface):
                 assert isinstance(element.text, str)
                 yield EventType.ProcessingInstruction, (element.target, element.text)
             case "start":
+                self.child_counts.append(0)
                 yield EventType.TagStart, self.tag_event_data_from_element(element)
 
     def parse(self, data: BinaryReader | str) -> Iterator[Event]:
+        chunk_size = self.chunk_size
+
         if isinstance(data, str):
-            self.parser.feed(data)
+            for index in range(0, len(data), chunk_size):
+                self.parser.feed(data[index : index + chunk_size])
+                yield from self.emit_events()
         else:
-            while chunk := data.read():
+            while chunk := data.read(chunk_size):
                 self.parser.feed(chunk)
                 yield from self.emit_events()
 
@@ -0,0 +1,507 @@
+# Copyright (C) 2018-'25  Frank Sachsenheim
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import codecs
+import re
+from typing import TYPE_CHECKING, Final, NoReturn
+
+from _delb.exceptions import ParsingProcessingError, ParsingValidityError
+from _delb.names import XML_NAMESPACE, XMLNS_NAMESPACE
+from _delb.parser import EventType, TagEventData
+from _delb.plugins import XMLEventParserInterface
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from _delb.parser import Event, ParserOptions
+    from _delb.typing import BinaryReader, _AttributesData
+
+    _Namespaces = dict[str, str]
+    _RawAttribute = tuple[str, str, str, str]
+
+
+# patterns
+
+_S: Final = "[ \t\n]"
+
+_NAME_START_CHARACTERS: Final = (
+    "A-Z_a-z\\xC0-\\xD6\\xD8-\\xF6\\xF8-\\u02FF\\u0370-\\u037D\\u037F-\\u1FFF"
+    "\\u200C\\u200D\\u2070-\\u218F\\u2C00-\\u2FEF\\u3001-\\uD7FF\\uF900-\\uFDCF"
+    "\\uFDF0-\\uFFFD\\U00010000-\\U000EFFFF"
+)
+_NAME_CHARACTERS: Final = (
+    _NAME_START_CHARACTERS + "\\-.0-9\\xB7\\u0300-\\u036F\\u203F\\u2040"
+)
+_NC_NAME: Final = f"[{_NAME_START_CHARACTERS}][{_NAME_CHARACTERS}]*"
+_NAME: Final = f"[:{_NAME_START_CHARACTERS}][:{_NAME_CHARACTERS}]*"
+_QUALIFIED_NAME: Final = f"(?:{_NC_NAME}:)?{_NC_NAME}"
+_PARTIAL_QUALIFIED_NAME: Final = f"{_NC_NAME}(?::(?:{_NC_NAME})?)?"
+
+_ATTRIBUTE: Final = f"{_S}+{_QUALIFIED_NAME}{_S}*={_S}*(?:\"[^<\"]*\"|'[^<']*')"
+_PARTIAL_ATTRIBUTE: Final = (
+    f"{_PARTIAL_QUALIFIED_NAME}(?:{_S}*(?:={_S}*(?:\"[^<\"]*|'[^<']*)?)?)?"
+)
+_LITERAL: Final = "(?:\"[^\"]*\"|'[^']*')"
+_PUBLIC_ID_LITERAL: Final = (
+    "(?:\"[- \na-zA-Z0-9'()+,./:=?;!*#@$_%]*\"|'[- \na-zA-Z0-9()+,./:=?;!*#@$_%]*')"
+)
+_EXTERNAL_ID: Final = (
+    f"(?:SYSTEM{_S}+{_LITERAL}|PUBLIC{_S}+{_PUBLIC_ID_LITERAL}{_S}+{_LITERAL})"
+)
+# the declarations in an internal subset are only lexed to find its end
+_INTERNAL_SUBSET: Final = (
+    f"\\[(?:{_S}|%{_NAME};|<!--.*?-->|<\\?.*?\\?>"
+    f"|<![A-Z](?:[^\"'<>]|{_LITERAL})*>)*\\]"
+)
+
+
+_find_attributes: Final = re.compile(
+    f"{_S}+(?:({_NC_NAME}):)?({_NC_NAME}){_S}*={_S}*(?:\"([^\"]*)\"|'([^']*)')"
+).findall
+_match_document_type_declaration: Final = re.compile(
+    f"<!DOCTYPE{_S}+{_QUALIFIED_NAME}(?:{_S}+{_EXTERNAL_ID})?{_S}*"
+    f"(?:{_INTERNAL_SUBSET}{_S}*)?>",
+    flags=re.DOTALL,
+).match
+_match_incomplete_start_tag: Final = re.compile(
+    f"<(?:{_PARTIAL_QUALIFIED_NAME}(?:{_ATTRIBUTE})*{_S}*(?:{_PARTIAL_ATTRIBUTE}|/)?)?"
+    "\\Z"
+).match
+_match_processing_instruction: Final = re.compile(
+    f"({_NC_NAME})(?:{_S}+(.*))?", flags=re.DOTALL
+).fullmatch
+_match_start_tag: Final = re.compile(
+    f"<((?:({_NC_NAME}):)?({_NC_NAME}))((?:{_ATTRIBUTE})*){_S}*(/?)>"
+).match
+_match_xml_declaration: Final = re.compile(
+    f"<\\?xml{_S}+version{_S}*={_S}*(?:\"1\\.[0-9]+\"|'1\\.[0-9]+')"
+    f"(?:{_S}+encoding{_S}*={_S}*"
+    "(?:\"[A-Za-z][A-Za-z0-9._-]*\"|'[A-Za-z][A-Za-z0-9._-]*'))?"
+    f"(?:{_S}+standalone{_S}*={_S}*(?:\"(?:yes|no)\"|'(?:yes|no)'))?{_S}*\\?>"
+).match
+_search_invalid_character: Final = re.compile(
+    "[^\t\n\r\\x20-\\uD7FF\\uE000-\\uFFFD\\U00010000-\\U0010FFFF]"
+).search
+_sub_reference: Final = re.compile(f"&(?:#([0-9]+);|#x([0-9a-fA-F]+);|({_NAME});)?").sub
+
+
+DECLARATION_STARTS: Final = ("<!--", "<![CDATA[", "<!DOCTYPE")
+DEFAULT_NAMESPACES: Final[dict[str, str]] = {"": "", "xml": XML_NAMESPACE}
+PREDEFINED_ENTITIES: Final = {
+    "amp": "&",
+    "apos": "'",
+    "gt": ">",
+    "lt": "<",
+    "quot": '"',
+}
+WHITESPACE: Final = " \t\n"
+
+
+class NativeParser(XMLEventParserInterface):
+    """
+    A parser that is implemented with regular expressions and doesn't depend on other
+    libraries.  It doesn't support *Document Type Declarations*, these are skipped and
+    references to other than the predefined entities are refused.
+    """
+
+    __slots__ = (
+        "at_start",
+        "buffer",
+        "carriage_return",
+        "decoder",
+        "has_document_type",
+        "line",
+        "open_tags",
+        "options",
+        "reference_position",
+        "root_was_closed",
+        "text",
+    )
+
+    # a final value is kept as class attribute when compiled with mypyc
+    name: Final = "native"
+
+    def __init__(self, options: ParserOptions, base_url: str | None, encoding: str):
+        self.at_start = True
+        self.buffer = ""
+        # a trailing carriage return is held back as a line feed may follow
+        self.carriage_return = False
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.has_document_type = False
+        self.line = 1
+        self.open_tags: list[tuple[str, TagEventData, _Namespaces]] = []
+        self.options: Final = options
+        self.reference_position = 0
+        self.root_was_closed = False
+        self.text: list[str] = []
+
+    def decode_reference(self, match: re.Match) -> str:
+        decimal, hexadecimal, name = match.groups()
+        if decimal or hexadecimal:
+            code = int(decimal, 10) if decimal else int(hexadecimal, 16)
+            if code <= 0x10FFFF and (
+                _search_invalid_character(character := chr(code)) is None
+            ):
+                return character
+            self.fail(
+                f"Reference to an invalid character: {match.group()}",
+                self.reference_position,
+            )
+        if name:
+            if (replacement := PREDEFINED_ENTITIES.get(name)) is not None:
+                return replacement
+            if self.has_document_type:
+                raise ParsingProcessingError(
+                    f"The entity '{name}' may be declared in a Document Type "
+                    "Declaration which isn't supported by this parser."
+                )
+            self.fail(
+                f"Reference to an undeclared entity: {name}", self.reference_position
+            )
+        self.fail("Unescaped ampersand.", self.reference_position)
+
+    def declare_namespaces(
+        self, namespaces: _Namespaces, attributes: list[_RawAttribute], index: int
+    ) -> tuple[_Namespaces, list[_RawAttribute]]:
+        declared: set[str] = set()
+        namespaces = namespaces.copy()
+        remaining: list[_RawAttribute] = []
+
+        for attribute in attributes:
+            prefix, local_name, double_quoted, single_quoted = attribute
+            if prefix == "xmlns":
+                prefix = local_name
+            elif not prefix and local_name == "xmlns":
+                prefix = ""
+            else:
+                remaining.append(attribute)
+                continue
+
+            if prefix in declared:
+                self.fail(f"Redundant namespace declaration: {prefix}", index)
+            declared.add(prefix)
+
+            namespace = self.normalize_attribute_value(
+                double_quoted or single_quoted, index
+            )
+            if prefix == "xmlns" or namespace == XMLNS_NAMESPACE:
+                self.fail("The xmlns namespace must not be declared.", index)
+            if (prefix == "xml") is not (namespace == XML_NAMESPACE):
+                self.fail("The xml prefix must be bound to the XML namespace.", index)
+            if prefix and not namespace:
+                self.fail(f"The prefix {prefix} is bound to no namespace.", index)
+
+            namespaces[prefix] = namespace
+
+        return namespaces, remaining
+
+    def fail(self, message: str, position: int) -> NoReturn:
+        # the position is relative to the buffer's contents
+        line = self.line + self.buffer.count("\n", 0, position)
+        raise ParsingValidityError(f"{message} (line {line})")
+
+    def feed(self, data: str, final: bool) -> Iterator[Event]:
+        if self.carriage_return:
+            data = "\r" + data
+        self.carriage_return = data.endswith("\r") and not final
+        if self.carriage_return:
+            data = data[:-1]
+        if "\r" in data:
+            data = data.replace("\r\n", "\n").replace("\r", "\n")
+
+        if (match := _search_invalid_character(data)) is not None:
+            position = len(self.buffer) + match.start()
+            self.buffer += data
+            self.fail(f"Invalid character: {match.group()!r}", position)
+
+        if self.buffer:
+            self.buffer += data
+        elif self.at_start and data.startswith("\ufeff"):
+            self.buffer = data[1:]
+        else:
+            self.buffer = data
+
+        yield from self.process_buffer(final)
+
+        if final:
+            if self.open_tags:
+                self.fail(f"Unclosed tag: {self.open_tags[-1][0]}", len(self.buffer))
+            if not self.root_was_closed:
+                self.fail("The stream contained no root element.", 0)
+
+    def handle_cdata_section(self, buffer: str, index: int) -> tuple[int, None]:
+        if (end := buffer.find("]]>", index + 9)) == -1:
+            return -1, None
+        if not self.open_tags:
+            self.fail("Misplaced CDATA section.", index)
+        self.text.append(buffer[index + 9 : end])
+        return end + 3, None
+
+    def handle_comment(self, buffer: str, index: int) -> tuple[int, Event | None]:
+        if (end := buffer.find("-->", index + 4)) == -1:
+            return -1, None
+        content = buffer[index + 4 : end]
+        if "--" in content or content.endswith("-"):
+            self.fail("A comment must not contain '--'.", index)
+        if self.options.remove_comments:
+            return end + 3, None
+        return end + 3, (EventType.Comment, content)
+
+    def handle_declaration(
+        self, buffer: str, index: int, final: bool
+    ) -> tuple[int, Event | None]:
+        if buffer.startswith("<!--", index):
+            return self.handle_comment(buffer, index)
+        if buffer.startswith("<![CDATA[", index):
+            return self.handle_cdata_section(buffer, index)
+        if buffer.startswith("<!DOCTYPE", index):
+            return self.handle_document_type_declaration(buffer, index)
+
+        if not final:
+            start = buffer[index:]
+            if any(s.startswith(start) for s in DECLARATION_STARTS):
+                return -1, None
+        self.fail("Invalid markup declaration.", index)
+
+    def handle_document_type_declaration(
+        self, buffer: str, index: int
+    ) -> tuple[int, None]:
+        if (match := _match_document_type_declaration(buffer, index)) is None:
+            # unlike with tags, invalid declarations are reported at the stream's
+            # end as their terminating character isn't unambiguous
+            return -1, None
+        if self.has_document_type or self.open_tags or self.root_was_closed:
+            self.fail("Misplaced Document Type Declaration.", index)
+        self.has_document_type = True
+        return match.end(), None
+
+    def handle_end_tag(self, buffer: str, index: int) -> tuple[int, Event | None]:
+        if (end := buffer.find(">", index)) == -1:
+            return -1, None
+        if not self.open_tags:
+            self.fail("Unexpected end tag.", index)
+        name, data, _ = self.open_tags.pop()
+        if buffer[index + 2 : end].rstrip(WHITESPACE) != name:
+            self.fail(f"Expected the end tag of {name}.", index)
+        if not self.open_tags:
+            self.root_was_closed = True
+        return end + 1, (EventType.TagEnd, data)
+
+    def handle_processing_instruction(
+        self, buffer: str, index: int
+    ) -> tuple[int, Event | None]:
+        if (end := buffer.find("?>", index + 2)) == -1:
+            return -1, None
+        if (match := _match_processing_instruction(buffer, index + 2, end)) is None:
+            self.fail("Invalid processing instruction.", index)
+        target, content = match.groups()
+        if target.lower() == "xml":
+            self.fail("Misplaced XML declaration.", index)
+        if self.options.remove_processing_instructions:
+            return end + 2, None
+        return end + 2, (EventType.ProcessingInstruction, (target, content or ""))
+
+    def handle_start_tag(
+        self, buffer: str, index: int, final: bool
+    ) -> tuple[int, Event | None]:
+        if (match := _match_start_tag(buffer, index)) is None:
+            if not final and _match_incomplete_start_tag(buffer, index) is not None:
+                return -1, None
+            self.fail("Invalid start tag.", index)
+
+        if self.root_was_closed:
+            self.fail("The stream contained extra contents.", index)
+
+        name, prefix, local_name, attributes_string, _ = match.groups()
+        open_tags = self.open_tags
+        namespaces = open_tags[-1][2] if open_tags else DEFAULT_NAMESPACES
+
+        raw_attributes: list[_RawAttribute]
+        if attributes_string:
+            raw_attributes = _find_attributes(attributes_string)
+            if "xmlns" in attributes_string:
+                namespaces, raw_attributes = self.declare_namespaces(
+                    namespaces, raw_attributes, index
+                )
+        else:
+            raw_attributes = []
+
+        if (namespace := namespaces.get(prefix or "")) is None:
+            self.fail(f"Undeclared namespace prefix: {prefix}", index)
+
+        data = TagEventData(
+            namespace,
+            local_name,
+            self.process_attributes(raw_attributes, namespace, namespaces, index),
+        )
+        if match.group(5):
+            self.root_was_closed = not open_tags
+        else:
+            open_tags.append((name, data, namespaces))
+        return match.end(), (EventType.TagStart, data)
+
+    def normalize_attribute_value(self, value: str, index: int) -> str:
+        if "\t" in value or "\n" in value:
+            value = value.replace("\t", " ").replace("\n", " ")
+        if "&" in value:
+            self.reference_position = index
+            value = _sub_reference(self.decode_reference, value)
+        return value
+
+    def parse(self, data: BinaryReader | str) -> Iterator[Event]:
+        chunk_size = self.options.chunk_size
+
+        if isinstance(data, str):
+            for index in range(0, len(data), chunk_size):
+                yield from self.feed(data[index : index + chunk_size], final=False)
+            yield from self.feed("", final=True)
+        else:
+            decoder = self.decoder
+            while chunk := data.read(chunk_size):
+                yield from self.feed(decoder.decode(chunk), final=False)
+            yield from self.feed(decoder.decode(b"", final=True), final=True)
+
+    def process_attributes(
+        self,
+        raw_attributes: list[_RawAttribute],
+        namespace: str,
+        namespaces: _Namespaces,
+        index: int,
+    ) -> _AttributesData:
+        attributes: _AttributesData = {}
+        for (
+            attribute_prefix,
+            local_attribute_name,
+            double_quoted,
+            single_quoted,
+        ) in raw_attributes:
+            value = double_quoted or single_quoted
+            if "&" in value or "\t" in value or "\n" in value:
+                value = self.normalize_attribute_value(value, index)
+
+            if not attribute_prefix:
+                attributes[(namespace, local_attribute_name)] = value
+            elif (attribute_namespace := namespaces.get(attribute_prefix)) is not None:
+                attributes[(attribute_namespace, local_attribute_name)] = value
+            else:
+                self.fail(f"Undeclared namespace prefix: {attribute_prefix}", index)
+
+        if len(attributes) != len(raw_attributes):
+            self.validate_attribute_names(raw_attributes, namespaces, index)
+
+        return attributes
+
+    def process_buffer(self, final: bool) -> Iterator[Event]:  # noqa: C901
+        buffer = self.buffer
+        open_tags = self.open_tags
+        position = 0
+        text = self.text
+
+        if self.at_start:
+            if (position := self.skip_xml_declaration(final)) == -1:
+                return
+            self.at_start = False
+
+        while True:
+            if (index := buffer.find("<", position)) == -1:
+                if not final:
+                    # the character data may continue with the next chunk
+                    break
+                index = len(buffer)
+
+            if index > position:
+                if open_tags:
+                    content = buffer[position:index]
+                    if "]]>" in content:
+                        self.fail("Unescaped ']]>' in character data.", position)
+                    if "&" in content:
+                        self.reference_position = position
+                        content = _sub_reference(self.decode_reference, content)
+                    text.append(content)
+                elif buffer[position:index].strip(WHITESPACE):
+                    self.fail("Character data outside the root element.", position)
+                position = index
+
+            if index == len(buffer):
+                break
+
+            match buffer[index + 1 : index + 2]:
+                case "/":
+                    end, event = self.handle_end_tag(buffer, index)
+                case "!":
+                    end, event = self.handle_declaration(buffer, index, final)
+                case "?":
+                    end, event = self.handle_processing_instruction(buffer, index)
+                case "":
+                    end, event = -1, None
+                case _:
+                    end, event = self.handle_start_tag(buffer, index, final)
+
+            if end == -1:
+                if final:
+                    self.fail("Incomplete markup.", index)
+                break
+
+            if event is not None:
+                if text:
+                    yield EventType.Text, "".join(text)
+                    text.clear()
+                yield event
+                # a tag's end is only emitted along its start if it's empty
+                if event[0] is EventType.TagStart and buffer[end - 2] == "/":
+                    yield EventType.TagEnd, event[1]
+
+            position = end
+
+        self.line += buffer.count("\n", 0, position)
+        self.buffer = buffer[position:]
+
+    def skip_xml_declaration(self, final: bool) -> int:
+        buffer = self.buffer
+        if not buffer.startswith("<?xml"):
+            if not final and "<?xml".startswith(buffer):
+                return -1
+            return 0
+
+        if (match := _match_xml_declaration(buffer)) is not None:
+            return match.end()
+
+        match buffer[5:6]:
+            case "" if not final:
+                return -1
+            case " " | "\t" | "\n":
+                if not final and "?>" not in buffer:
+                    return -1
+                self.fail("Invalid XML declaration.", 0)
+
+        # it's a processing instruction with a target that starts with 'xml'
+        return 0
+
+    def validate_attribute_names(
+        self, raw_attributes: list[_RawAttribute], namespaces: _Namespaces, index: int
+    ):
+        names = {(p, n) for p, n, _, _ in raw_attributes}
+        if len(names) != len(raw_attributes):
+            self.fail("Redundant attribute.", index)
+        prefixed_names = [(namespaces[p], n) for p, n in names if p]
+        if len(set(prefixed_names)) != len(prefixed_names):
+            self.fail("Redundant attribute.", index)
+        # otherwise an unprefixed attribute has the same universal name as a prefixed
+        # one as these take the tag's namespace, the last one prevails
+
+
+__all__ = (NativeParser.__name__,)
@@ -0,0 +1,202 @@
+# Copyright (C) 2018-'25  Frank Sachsenheim
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import codecs
+from typing import TYPE_CHECKING, Final
+from xml.parsers import expat
+from xml.sax.saxutils import prepare_input_source
+
+from _delb.exceptions import ParsingProcessingError
+from _delb.parser import EventType, TagEventData
+from _delb.plugins import XMLEventParserInterface
+from _delb.plugins.expat_parser import NAMESPACE_SEPARATOR, EntityResolver
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from _delb.parser import Event, ParserOptions
+    from _delb.typing import BinaryReader
+
+
+TEXT_BUFFER_SIZE: Final = 2**16
+
+
+class PyexpatParser(XMLEventParserInterface):
+    """
+    This adapter binds its handlers immediately to a parser object of the standard
+    library's :mod:`xml.parsers.expat` module and thereby skips the abstraction
+    layers of its :mod:`xml.sax` interface that the ``expat`` adapter employs.
+    """  # noqa: RST304
+
+    __slots__ = (
+        "encoding",
+        "entity_resolver",
+        "events",
+        "names",
+        "options",
+        "parser",
+        "tags",
+    )
+
+    name = "pyexpat"
+
+    def __init__(self, options: ParserOptions, base_url: str | None, encoding: str):
+        self.encoding = codecs.lookup(encoding).name
+        self.entity_resolver = EntityResolver(options, base_url)
+        self.events: list[Event] = []
+        # maps expat's (interned) names to namespace and local name
+        self.names: dict[str, tuple[str, str]] = {}
+        self.options = options
+        self.tags: list[TagEventData] = []
+        self.parser = self.make_parser(base_url)
+
+    def emit_events(self) -> Iterator[Event]:
+        events = self.events
+        if not events:
+            return
+
+        # the buffered text is passed at the end of each fed chunk, it may continue
+        # in the next one
+        if (last_event := events[-1])[0] is EventType.Text:
+            events.pop()
+            yield from events
+            events.clear()
+            events.append(last_event)
+        else:
+            yield from events
+            events.clear()
+
+    def handle_comment(self, content: str):
+        self.events.append((EventType.Comment, content))
+
+    def handle_end_tag(self, name: str):
+        self.events.append((EventType.TagEnd, self.tags.pop()))
+
+    def handle_external_entity_reference(
+        self,
+        context: str,
+        base: str | None,
+        system_id: str | None,
+        public_id: str | None,
+    ) -> int:
+        url = self.entity_resolver.resolveEntity(public_id, system_id)
+        stream = prepare_input_source(url).getByteStream()
+        assert stream is not None
+        parser = self.parser.ExternalEntityParserCreate(context)
+        chunk_size = self.options.chunk_size
+
+        try:
+            while chunk := stream.read(chunk_size):
+                parser.Parse(chunk, False)
+            parser.Parse(b"", True)
+        except Exception:
+            return 0
+        finally:
+            stream.close()
+
+        return 1
+
+    def handle_processing_instruction(self, target: str, content: str):
+        self.events.append((EventType.ProcessingInstruction, (target, content)))
+
+    def handle_skipped_entity(self, name: str, is_parameter_entity: bool):
+        raise ParsingProcessingError(f"The entity '{name}' is not declared.")
+
+    def handle_start_tag(self, name: str, attributes: list[str]):
+        namespace, local_name = self.split_name(name)
+
+        data = TagEventData(namespace, local_name, {})
+        if attributes:
+            _attributes = data.attributes
+            items = iter(attributes)
+            for attribute_name, value in zip(items, items):
+                attribute_namespace, attribute_local_name = self.split_name(
+                    attribute_name
+                )
+                _attributes[
+                    (attribute_namespace or namespace, attribute_local_name)
+                ] = value
+
+        self.tags.append(data)
+        self.events.append((EventType.TagStart, data))
+
+    def handle_text(self, content: str):
+        events = self.events
+        # text that exceeds the buffer or is interrupted by an unreported node
+        # is passed in multiple calls
+        if events and events[-1][0] is EventType.Text:
+            text = events[-1][1]
+            assert isinstance(text, str)
+            events[-1] = (EventType.Text, text + content)
+        else:
+            events.append((EventType.Text, content))
+
+    def make_parser(self, base_url: str | None) -> expat.XMLParserType:
+        parser = expat.ParserCreate(
+            "utf-8" if self.encoding == "utf-8" else None, NAMESPACE_SEPARATOR
+        )
+        if base_url is not None:
+            parser.SetBase(base_url)
+        parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_UNLESS_STANDALONE)
+
+        parser.buffer_text = True
+        parser.buffer_size = max(TEXT_BUFFER_SIZE, self.options.chunk_size)
+        parser.ordered_attributes = True
+
+        parser.CharacterDataHandler = self.handle_text
+        parser.EndElementHandler = self.handle_end_tag
+        parser.ExternalEntityRefHandler = self.handle_external_entity_reference
+        parser.SkippedEntityHandler = self.handle_skipped_entity
+        parser.StartElementHandler = self.handle_start_tag
+        if not self.options.remove_comments:
+            parser.CommentHandler = self.handle_comment
+        if not self.options.remove_processing_instructions:
+            parser.ProcessingInstructionHandler = self.handle_processing_instruction
+
+        return parser
+
+    def parse(self, data: BinaryReader | str) -> Iterator[Event]:
+        chunk_size = self.options.chunk_size
+        feed = self.parser.Parse
+
+        if isinstance(data, str):
+            for index in range(0, len(data), chunk_size):
+                feed(data[index : index + chunk_size], False)
+                yield from self.emit_events()
+        elif self.encoding == "utf-8":
+            # expat decodes this encoding natively
+            while chunk := data.read(chunk_size):
+                feed(chunk, False)
+                yield from self.emit_events()
+        else:
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            while chunk := data.read(chunk_size):
+                feed(decoder.decode(chunk), False)
+                yield from self.emit_events()
+            feed(decoder.decode(b"", final=True), False)
+
+        feed("", True)
+        yield from self.events
+
+    def split_name(self, name: str) -> tuple[str, str]:
+        if (result := self.names.get(name)) is None:
+            namespace, _, local_name = name.rpartition(NAMESPACE_SEPARATOR)
+            result = self.names[name] = (namespace, local_name)
+        return result
+
+
+__all__ = (PyexpatParser.__name__,)
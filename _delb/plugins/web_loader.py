@@ -21,6 +21,8 @@ dependencies for this loader are installed as well. See :doc:`/installation`.
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from io import IOBase
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -30,7 +32,7 @@ from _delb.plugins import plugin_manager
 from _delb.plugins.core_loaders import buffer_loader
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Iterator
     from types import SimpleNamespace
     from typing import Final
 
@@ -66,6 +68,54 @@ class HttpsStreamWrapper(IOBase):
             return b""
 
 
+class AsyncHttpsStreamWrapper(IOBase):
+    """
+    Provides the chunks of a response that is received in an event loop to a parser
+    that reads from another thread. The received chunks are buffered, so that a read
+    only waits for the event loop when all previously received data is consumed.
+    """
+
+    __slots__ = ("_buffer", "_chunks", "_loop")
+
+    def __init__(self, response: httpx.Response, loop: asyncio.AbstractEventLoop):
+        self._buffer: Final = bytearray()
+        self._chunks: Final = response.aiter_bytes()
+        self._loop: Final = loop
+
+    async def _next_chunk(self) -> bytes:
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+    def _receive_chunk(self) -> bytes:
+        return asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+
+    def read(self, size: int = -1) -> bytes:
+        buffer = self._buffer
+        if not buffer:
+            buffer += self._receive_chunk()
+        if size < 0:
+            while chunk := self._receive_chunk():
+                buffer += chunk
+            size = len(buffer)
+
+        result = bytes(buffer[:size])
+        del buffer[:size]
+        return result
+
+
+@asynccontextmanager
+async def _async_client(
+    client: Optional[httpx.AsyncClient],
+) -> AsyncIterator[httpx.AsyncClient]:
+    if client is None:
+        async with httpx.AsyncClient(follow_redirects=True, http2=http2) as client:
+            yield client
+    else:
+        yield client
+
+
 @plugin_manager.register_loader()
 def web_loader(
     data: Any, config: SimpleNamespace, client: httpx.Client = DEFAULT_CLIENT
@@ -15,20 +15,26 @@
 
 from __future__ import annotations
 
+import codecs
+import os
 from abc import ABC
-from io import StringIO, TextIOWrapper
+from io import IOBase, StringIO
+from queue import Queue
+from threading import Semaphore, Thread
 
 from typing import (
     TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    cast,
     ClassVar as ClassWar,
     Final,
+    IO,
     Literal,
     NamedTuple,
     Optional,
-    TextIO,
 )
 
-from _delb.filters import is_tag_node
 from _delb.names import GLOBAL_PREFIXES, Namespaces
 
 from _delb.typing import (
@@ -39,10 +45,10 @@ from _delb.typing import (
     TagNodeType,
     TextNodeType,
 )
-from _delb.utils import _crunch_whitespace, traverse_bf_ltr_ttb
+from _delb.utils import _crunch_whitespace
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
     from _delb.nodes import Siblings
     from _delb.typing import XMLNodeType
@@ -51,18 +57,37 @@ if TYPE_CHECKING:
 # constants
 
 
-CTRL_CHAR_ENTITY_NAME_MAPPING: Final = (
-    ("&", "amp"),
-    (">", "gt"),
-    ("<", "lt"),
-    ('"', "quot"),
-)
-CCE_TABLE_FOR_ATTRIBUTES: Final = str.maketrans(
-    {ord(k): f"&{v};" for k, v in CTRL_CHAR_ENTITY_NAME_MAPPING}
-)
-CCE_TABLE_FOR_TEXT: Final = str.maketrans(
-    {ord(k): f"&{v};" for k, v in CTRL_CHAR_ENTITY_NAME_MAPPING if k != '"'}
-)
+DEFAULT_WRITER_BLOCK_SIZE: Final = 2**16
+# measurements never exceed the line width, so only few are relevant at once
+_MEASUREMENTS_CACHE_SIZE: Final = 2**12
+
+
+# escaping
+
+# most contents don't contain any of the control characters, checking their presence
+# is considerably cheaper than a translation of all characters with str.translate
+
+
+def _escape_attribute_value(value: str) -> str:
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    return value
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
 
 
 # configuration
@@ -149,6 +174,67 @@ class DefaultStringOptions:
 # serializer
 
 
+def _iterate_serialization(
+    serialize: Callable[[Serializer], Any],
+    *,
+    chunk_size: int,
+    encoding: str,
+    format_options: Optional[FormatOptions],
+    namespaces: Optional[NamespaceDeclarations],
+    newline: Optional[str],
+) -> Iterator[bytes]:
+    # the serializers push their output, hence the serialization is run in another
+    # thread. the arguments are validated before the iteration starts.
+    channel = _ChunksChannel(chunk_size)
+    serializer = _get_serializer(
+        _BinaryBufferWriter(
+            cast("BinaryIO", channel),
+            encoding=encoding,
+            newline=newline,
+            block_size=chunk_size,
+        ),
+        format_options=format_options,
+        namespaces=namespaces,
+    )
+
+    def produce():
+        channel.requests.acquire()
+        try:
+            if channel.aborted:
+                raise _SerializationAborted
+            serialize(serializer)
+            channel.send_rest()
+        except BaseException as exception:
+            channel.queue.put(exception)
+        else:
+            channel.queue.put(None)
+
+    return _iterate_chunks(channel, Thread(target=produce, daemon=True))
+
+
+def _iterate_chunks(channel: _ChunksChannel, producer: Thread) -> Iterator[bytes]:
+    # the producer only proceeds while the consumer awaits the next chunk, hence it
+    # never reads the tree while the consumer's code runs
+    producer.start()
+    finished = False
+    try:
+        while True:
+            channel.requests.release()
+            if not isinstance(chunk := channel.queue.get(), bytes):
+                break
+            yield chunk
+        finished = True
+        if chunk is not None:
+            raise chunk
+    finally:
+        if not finished:
+            # the consumer stopped early, the producer ends with its next resumption
+            channel.aborted = True
+            channel.requests.release()
+            channel.queue.get()
+        producer.join()
+
+
 def _get_serializer(
     writer: _SerializationWriter,
     format_options: Optional[FormatOptions],
@@ -200,41 +286,38 @@ class Serializer:
         if root.namespace not in self._namespaces.values():
             self._prefixes[root.namespace] = ""
 
-        for node in traverse_bf_ltr_ttb(root, is_tag_node):
-            assert isinstance(node, TagNodeType)
-            for namespace in {node.namespace} | {
-                a.namespace for a in node.attributes.values()
-            }:
-                if namespace in self._prefixes:
-                    continue
-
-                if not namespace:
-                    # an empty/null namespace can't be assigned to a prefix,
-                    # it must be the default namespace
-                    self.__redeclare_empty_prefix()
-                    self._prefixes[""] = ""
-                    continue
-                assert namespace is not None
-
-                if (prefix := self._namespaces.lookup_prefix(namespace)) is None:
-                    # the namespace isn't declared by the user
-                    self._new_namespace_declaration(namespace)
-                    continue
-
-                if prefix == "" and "" in self._prefixes.values():
-                    # a default namespace was declared, but that one is required for the
-                    # empty/null namespace
-                    self._new_namespace_declaration(namespace)
-                    continue
-
-                if len(prefix):
-                    # that found prefix still needs a colon for faster serialisat
-                    # composition later
-                    assert f"{prefix}:" not in self._prefixes.values()
-                    self._prefixes[namespace] = f"{prefix}:"
-                else:
-                    assert "" not in self._prefixes.values()
-                    self._prefixes[namespace] = ""
+        # the used namespaces are usually cached from parsing or previous serializations
+        for namespace in root._get_used_namespaces():
+            if namespace in self._prefixes:
+                continue
+
+            if not namespace:
+                # an empty/null namespace can't be assigned to a prefix,
+                # it must be the default namespace
+                self.__redeclare_empty_prefix()
+                self._prefixes[""] = ""
+                continue
+            assert namespace is not None
+
+            if (prefix := self._namespaces.lookup_prefix(namespace)) is None:
+                # the namespace isn't declared by the user
+                self._new_namespace_declaration(namespace)
+                continue
+
+            if prefix == "" and "" in self._prefixes.values():
+                # a default namespace was declared, but that one is required for the
+                # empty/null namespace
+                self._new_namespace_declaration(namespace)
+                continue
+
+            if len(prefix):
+                # that found prefix still needs a colon for faster serialisat
+                # composition later
+                assert f"{prefix}:" not in self._prefixes.values()
+                self._prefixes[namespace] = f"{prefix}:"
+            else:
+                assert "" not in self._prefixes.values()
+                self._prefixes[namespace] = ""
 
     def __redeclare_empty_prefix(self):
         # a possibly collected declaration of an empty namespace needs to be mapped to
@@ -249,12 +332,11 @@ class Serializer:
                 break
 
     def _generate_attributes_data(self, node: TagNodeType) -> dict[str, str]:
-        data = {}
-        for attribute in (node.attributes[a] for a in sorted(node.attributes)):
-            data[self._prefixes[attribute.namespace] + attribute.local_name] = (
-                f'"{attribute.value.translate(CCE_TABLE_FOR_ATTRIBUTES)}"'
-            )
-        return data
+        prefixes = self._prefixes
+        return {
+            prefixes[namespace] + local_name: value
+            for namespace, local_name, value in node.attributes._get_escaped_items()
+        }
 
     def _handle_child_nodes(self, child_nodes: Siblings):
         for child_node in child_nodes:
@@ -269,9 +351,8 @@ class Serializer:
         else:  # pragma: no cover
             raise NotImplementedError("Just don't.")
 
-    def _serialize_attributes(self, attributes_data):
-        for key, value in attributes_data.items():
-            self.writer(f" {key}={value}")
+    def _render_attributes(self, attributes_data: dict[str, str]) -> str:
+        return "".join(f" {key}={value}" for key, value in attributes_data.items())
 
     def serialize_node(self, node: XMLNodeType):
         match node:
@@ -284,7 +365,7 @@ class Serializer:
                 )
             case TextNodeType():
                 if node.content:
-                    self.writer(node.content.translate(CCE_TABLE_FOR_TEXT))
+                    self.writer(_escape_text(node.content))
 
     def serialize_root(self, root: TagNodeType):
         self._collect_prefixes(root)
@@ -309,16 +390,17 @@ class Serializer:
     ):
         prefixed_name = self._prefixes[node.namespace] + node.local_name
 
-        self.writer(f"<{prefixed_name}")
         if attributes_data:
-            self._serialize_attributes(attributes_data)
+            start_tag = f"<{prefixed_name}{self._render_attributes(attributes_data)}"
+        else:
+            start_tag = f"<{prefixed_name}"
 
         if node._child_nodes:
-            self.writer(">")
+            self.writer(start_tag + ">")
             self._handle_child_nodes(node._child_nodes)
             self.writer(f"</{prefixed_name}>")
         else:
-            self.writer("/>")
+            self.writer(start_tag + "/>")
 
 
 class _LineFittingSerializer(Serializer):
@@ -338,11 +420,9 @@ class _LineFittingSerializer(Serializer):
         if isinstance(node, TextNodeType):
             if node.content:
                 if self.space == "default":
-                    content = _crunch_whitespace(node.content).translate(
-                        CCE_TABLE_FOR_TEXT
-                    )
+                    content = _escape_text(_crunch_whitespace(node.content))
                 else:
-                    content = node.content.translate(CCE_TABLE_FOR_TEXT)
+                    content = _escape_text(node.content)
                 self.writer(content)
             return
 
@@ -408,21 +488,22 @@ class PrettySerializer(Serializer):
             self.writer(self._level * self.indentation)
 
     def _normalize_text(self, text: str) -> str:
-        return _crunch_whitespace(text).translate(CCE_TABLE_FOR_TEXT)
+        return _escape_text(_crunch_whitespace(text))
 
-    def _serialize_attributes(self, attributes_data: dict[str, str]):
+    def _render_attributes(self, attributes_data: dict[str, str]) -> str:
         if self._align_attributes and len(attributes_data) > 1:
             key_width = max(len(k) for k in attributes_data)
-            for key, value in attributes_data.items():
-                self.writer(
-                    f"\n{self._level * self.indentation} {self.indentation}"
-                    f"{' ' * (key_width - len(key))}{key}={value}"
-                )
+            result = "".join(
+                f"\n{self._level * self.indentation} {self.indentation}"
+                f"{' ' * (key_width - len(key))}{key}={value}"
+                for key, value in attributes_data.items()
+            )
             if self.indentation:
-                self.writer(f"\n{self._level * self.indentation}")
+                result += f"\n{self._level * self.indentation}"
+            return result
 
         else:
-            super()._serialize_attributes(attributes_data)
+            return super()._render_attributes(attributes_data)
 
     def _serialize_child_nodes(self, child_nodes: Siblings):
         for node in child_nodes:
@@ -531,6 +612,7 @@ class PrettySerializer(Serializer):
 class TextWrappingSerializer(PrettySerializer):
     __slots__ = (
         "_line_fitting_serializer",
+        "_measured_lengths",
         "_width",
     )
 
@@ -545,13 +627,15 @@ class TextWrappingSerializer(PrettySerializer):
             raise ValueError("Invalid width option value.")
         self.writer: _LengthTrackingWriter
         super().__init__(
-            writer=_LengthTrackingWriter(writer.buffer),
+            writer=_LengthTrackingWriter(writer),
             format_options=format_options,
             namespaces=namespaces,
         )
         self._line_fitting_serializer: Final = _LineFittingSerializer(
             self.writer, namespaces=self._namespaces
         )
+        # maps node ids to the lengths of their single line serialisations
+        self._measured_lengths: Final[dict[int, int]] = {}
         self._width: Final = format_options.width
 
     @property
@@ -569,20 +653,39 @@ class TextWrappingSerializer(PrettySerializer):
         else:
             return 0
 
+    def _measure_node(self, node: XMLNodeType) -> int:
+        # counts required space for the serialisation of a node, as nothing beyond
+        # the width can fit a line, the counting stops there and a length that
+        # exceeds it is returned
+        width = self._width
+
+        if isinstance(node, TextNodeType):
+            result = self._required_space_for_text(node, width)
+        elif isinstance(node, (CommentNodeType, ProcessingInstructionNodeType)):
+            length = len(str(node))
+            result = length if length <= width else None
+        else:
+            assert isinstance(node, TagNodeType)
+            result = self._required_space_for_tag(node, width)
+
+        return width + 1 if result is None else result
+
     def _node_fits_remaining_line(self, node: XMLNodeType) -> bool:
         return self._required_space(node, self._available_space) is not None
 
     def _required_space(self, node: XMLNodeType, up_to: int) -> None | int:
-        # counts required space for the serialisation of a node
         # a returned None signals that the limit up_to was hit
+        # the measurements are memoized as they're repeatedly queried for the same
+        # nodes and recursively for their descendants and following nodes
+        # the memo is emptied when it's full to keep the memory usage constant
+        lengths = self._measured_lengths
+        if (length := lengths.get(id(node))) is None:
+            if len(lengths) >= _MEASUREMENTS_CACHE_SIZE:
+                lengths.clear()
+            length = lengths[id(node)] = self._measure_node(node)
+        return length if length <= up_to else None
 
-        if isinstance(node, TextNodeType):
-            return self._required_space_for_text(node, up_to)
-        if isinstance(node, (CommentNodeType, ProcessingInstructionNodeType)):
-            length = len(str(node))
-            return length if length <= up_to else None
-
-        assert isinstance(node, TagNodeType)
+    def _required_space_for_tag(self, node: TagNodeType, up_to: int) -> None | int:
 
         name_length = len(node.local_name) + len(self._prefixes[node.namespace])
         if len(node) == 0:
@@ -623,14 +726,13 @@ class TextWrappingSerializer(PrettySerializer):
     ) -> None | int:
         result = 0
 
-        attribute_names = tuple(node.attributes)
-        for attribute in (node.attributes[n] for n in attribute_names):
-            assert attribute is not None
+        prefixes = self._prefixes
+        for namespace, local_name, value in node.attributes._get_escaped_items():
             result += (
-                4  # preceding space and »="…"«
-                + len(attribute.local_name)
-                + len(self._prefixes[attribute.namespace])
-                + len(attribute.value.translate(CCE_TABLE_FOR_ATTRIBUTES))
+                2  # preceding space and »=«
+                + len(prefixes[namespace])
+                + len(local_name)
+                + len(value)
             )
             if result > up_to:
                 return None
@@ -652,7 +754,7 @@ class TextWrappingSerializer(PrettySerializer):
         # indeed this doesn't consider the case where a first
         # whitespace would appear in one of possible subsequent text
         # nodes
-        content = following.content.translate(CCE_TABLE_FOR_TEXT)
+        content = _escape_text(following.content)
         if (length := content.find(" ")) == -1:
             length = len(content)
 
@@ -727,6 +829,10 @@ class TextWrappingSerializer(PrettySerializer):
         ):
             self.writer("\n")
 
+    def serialize_root(self, root: TagNodeType):
+        self._measured_lengths.clear()
+        super().serialize_root(root)
+
     def _serialize_tag(
         self,
         node: TagNodeType,
@@ -876,30 +982,129 @@ class TextWrappingSerializer(PrettySerializer):
 
 
 class _SerializationWriter(ABC):
-    __slots__ = ("buffer",)
+    # the written fragments are collected and passed to the buffer as joined blocks of
+    # at least `block_size` characters as the buffers' write calls are comparably
+    # costly
 
-    def __init__(self, buffer: TextIO):
+    __slots__ = ("block_size", "buffer", "_fragments", "_fragments_size")
+
+    def __init__(self, buffer: IO, block_size: int = DEFAULT_WRITER_BLOCK_SIZE):
+        self.block_size: Final = block_size
         self.buffer: Final = buffer
+        self._fragments: Final[list[str]] = []
+        self._fragments_size = 0
 
     def __call__(self, data: str):
-        self.buffer.write(data)
+        self._fragments.append(data)
+        self._fragments_size += len(data)
+        if self._fragments_size >= self.block_size:
+            self._write_fragments()
+
+    def flush(self):
+        """Writes all collected fragments and flushes the buffer."""
+        self._write_fragments()
+        self.buffer.flush()
 
     @property
     def result(self):
         if isinstance(self.buffer, StringIO):
+            self._write_fragments()
             return self.buffer.getvalue()
         raise TypeError(  # pragma: no cover
             "Underlying buffer must be an instance of `io.StingIO`"
         )
 
+    def _write_block(self, data: str):
+        self.buffer.write(data)
+
+    def _write_fragments(self):
+        if self._fragments:
+            self._write_block("".join(self._fragments))
+            self._fragments.clear()
+            self._fragments_size = 0
+
+
+class _BinaryBufferWriter(_SerializationWriter):
+    # the joined blocks are encoded and written immediately to the binary buffer, the
+    # newline translation resembles that of io.TextIOWrapper
+
+    __slots__ = ("_encode", "_newline")
+
+    def __init__(
+        self,
+        buffer: BinaryIO,
+        encoding: str = "utf-8",
+        newline: Optional[str] = None,
+        block_size: int = DEFAULT_WRITER_BLOCK_SIZE,
+    ):
+        super().__init__(buffer, block_size=block_size)
+        self._encode: Final = codecs.getincrementalencoder(encoding)().encode
+        if newline is None:
+            newline = os.linesep
+        self._newline: Final = None if newline in ("", "\n") else newline
+
+    def flush(self):
+        """Writes all collected fragments, finalizes the encoding and flushes the
+        buffer."""
+        self._write_fragments()
+        if data := self._encode("", True):
+            self.buffer.write(data)
+        self.buffer.flush()
+
+    def _write_block(self, data: str):
+        if self._newline is not None:
+            data = data.replace("\n", self._newline)
+        self.buffer.write(self._encode(data))
+
+
+class _ChunksChannel(IOBase):
+    # a binary sink that passes the written data in chunks of a fixed size from a
+    # producing to a consuming thread. the consumer releases a request for each item
+    # it awaits, after passing a chunk the producer waits for the next one.
+
+    def __init__(self, chunk_size: int):
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be a positive integer.")
+        self.aborted = False
+        self.chunk_size: Final = chunk_size
+        self.queue: Final[Queue[bytes | BaseException | None]] = Queue(maxsize=1)
+        self.requests: Final = Semaphore(0)
+        self._data: Final = bytearray()
+
+    def send_rest(self):
+        if self._data:
+            self._send(bytes(self._data))
+            self._data.clear()
+
+    def write(self, data: bytes):
+        buffer = self._data
+        buffer += data
+        chunk_size = self.chunk_size
+        while len(buffer) >= chunk_size:
+            self._send(bytes(buffer[:chunk_size]))
+            del buffer[:chunk_size]
+
+    def _send(self, chunk: bytes):
+        self.queue.put(chunk)
+        self.requests.acquire()
+        if self.aborted:
+            raise _SerializationAborted
+
+
+class _SerializationAborted(Exception):
+    pass
+
 
 class _LengthTrackingWriter(_SerializationWriter):
-    __slots__ = ("offset", "preserve_space")
+    # wraps another writer to keep track of the current line's length
+
+    __slots__ = ("offset", "preserve_space", "_writer")
 
-    def __init__(self, buffer: TextIO):
-        super().__init__(buffer)
+    def __init__(self, writer: _SerializationWriter):
+        super().__init__(writer.buffer, block_size=writer.block_size)
         self.offset = 0
         self.preserve_space = False
+        self._writer: Final = writer
 
     def __call__(self, data: str):
         if not self.preserve_space and self.offset == 0:
@@ -917,21 +1122,21 @@ class _LengthTrackingWriter(_SerializationWriter):
                 self.offset = len(data) - (index + 1)
         super().__call__(data)
 
+    def flush(self):
+        self._write_fragments()
+        self._writer.flush()
 
-class _StringWriter(_SerializationWriter):
-    def __init__(self, newline: Optional[str] = None):
-        super().__init__(StringIO(newline=newline))
+    def _write_block(self, data: str):
+        self._writer._write_block(data)
 
 
-class _TextBufferWriter(_SerializationWriter):
+class _StringWriter(_SerializationWriter):
     def __init__(
         self,
-        buffer: TextIOWrapper,
-        encoding: str = "utf-8",
         newline: Optional[str] = None,
+        block_size: int = DEFAULT_WRITER_BLOCK_SIZE,
     ):
-        buffer.reconfigure(encoding=encoding, newline=newline)
-        super().__init__(buffer)
+        super().__init__(StringIO(newline=newline), block_size=block_size)
 
 
 #
@@ -59,6 +59,7 @@ class XMLNodeType(ABC):
 
     _child_nodes: Siblings
     _parent: None | ParentNodeType
+    _sibling_index: int
 
     @abstractmethod
     def __copy__(self): ...
@@ -341,6 +342,33 @@ class XMLNodeType(ABC):
     @abstractmethod
     def _iterate_reversed_descendants(self) -> Iterator[XMLNodeType]: ...
 
+    @abstractmethod
+    def iterate_xpath(
+        self,
+        expression: str,
+        namespaces: Optional[NamespaceDeclarations] = None,
+    ) -> Iterator[XMLNodeType]:
+        """
+        Iterator over the nodes that match an XPath expression with this node as
+        initial context node. Other than :meth:`XMLNodeType.xpath` the matching nodes
+        are yielded as soon as they're found, hence the tree is only traversed as far
+        as the results are consumed. E.g. to test whether there's any match:
+
+        >>> root = parse_tree("<root><a/><b/></root>")
+        >>> next(root.iterate_xpath("//a"), None) is not None
+        True
+
+        The tree must not be altered while the iterator is consumed.
+
+        :param expression: A supported XPath 1.0 expression that contains one or more
+                           location paths.
+        :param namespaces: A mapping of prefixes that are used in the expression to
+                           namespaces. If not provided the node's namespace will serve
+                           as default, mapped to an empty prefix.
+        :return: A :term:`generator iterator` that yields the matching nodes.
+        :meta category: Methods to query the tree
+        """
+
     @property
     @abstractmethod
     def parent(self) -> Optional[ParentNodeType]:
@@ -713,6 +741,9 @@ class TagNodeType(ParentNodeType):
         self, default: Literal["default", "preserve"] = "default"
     ) -> Literal["default", "preserve"]: ...
 
+    @abstractmethod
+    def _get_used_namespaces(self) -> tuple[str, ...]: ...
+
     @property
     @abstractmethod
     def id(self) -> Optional[str]:
@@ -727,6 +758,36 @@ class TagNodeType(ParentNodeType):
     @abstractmethod
     def id(self, value: str | None): ...
 
+    @abstractmethod
+    def iter_serialize(
+        self,
+        *,
+        chunk_size: int = 2**16,
+        encoding: str = "utf-8",
+        format_options: Optional[FormatOptions] = None,
+        namespaces: Optional[NamespaceDeclarations] = None,
+        newline: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """
+        Yields the encoded serialization of the node in chunks while it's produced.
+        Hence the consumed memory doesn't depend on the tree's size. The tree is only
+        read while the next chunk is awaited, yet it must not be altered before the
+        iteration is completed or abandoned. See :doc:`/api/serialization` for
+        details.
+
+        :param chunk_size: The size of the yielded chunks in bytes, only the last
+                           one may be smaller.
+        :param encoding: The desired text encoding.
+        :param format_options: An instance of :class:`delb.FormatOptions` can be
+                               provided to configure formatting.
+        :param namespaces: A mapping of prefixes to namespaces.  If not provided the
+                           node's namespace will serve as default namespace.  Prefixes
+                           for undeclared namespaces are enumerated with the prefix
+                           ``ns``.
+        :param newline: See :class:`io.TextIOWrapper` for a detailed explanation of the
+                        parameter with the same name.
+        """
+
     @property
     @abstractmethod
     def location_path(self) -> str:
@@ -812,6 +873,9 @@ class BinaryReader(Protocol):
 QualifiedName: TypeAlias = tuple[str, str]
 AttributeAccessor: TypeAlias = QualifiedName | str
 _AttributesData: TypeAlias = dict[QualifiedName, str]
+_EncodedNode: TypeAlias = (
+    "str | tuple[str] | tuple[str, str] | tuple[str, str, _AttributesData | None, int]"
+)
 
 GenericDecorated = TypeVar("GenericDecorated", bound=Callable[..., Any])
 SecondOrderDecorator: TypeAlias = "Callable[[GenericDecorated], GenericDecorated]"
@@ -839,6 +903,7 @@ __all__ = (
     "BinaryReader",
     CommentNodeType.__name__,
     _DocumentNodeType.__name__,
+    "_EncodedNode",
     "Filter",
     "GenericDecorated",
     "InputStream",
@@ -23,6 +23,7 @@ from functools import partial
 from itertools import chain
 from typing import TYPE_CHECKING, Any, Final, Optional
 
+from _delb.filters import _compile_filters
 from _delb.typing import _DocumentNodeType, TagNodeType
 
 if TYPE_CHECKING:
@@ -353,16 +354,18 @@ def _sort_nodes_in_document_order(
 
 
 def traverse_bf_ltr_ttb(root: XMLNodeType, *filters: Filter) -> Iterator[XMLNodeType]:
+    matches = _compile_filters(filters)
     queue = deque((root,))
     while queue:
         node = queue.popleft()
         if isinstance(node, TagNodeType):
             queue.extend(node._child_nodes)
-        if all(f(node) for f in filters):
+        if matches(node):
             yield node
 
 
 def traverse_df_ltr_btt(root: XMLNodeType, *filters: Filter) -> Iterator[XMLNodeType]:
+    matches = _compile_filters(filters)
     stack = [(root, deque(root._child_nodes))]
 
     while stack:
@@ -376,23 +379,25 @@ def traverse_df_ltr_btt(root: XMLNodeType, *filters: Filter) -> Iterator[XMLNode
                 )
                 break
             else:
-                if all(f(child) for f in filters):
+                if matches(child):
                     yield child
 
         else:
-            if all(f(node) for f in filters):
+            if matches(node):
                 yield node
 
 
 def traverse_df_ltr_ttb(root: XMLNodeType, *filters: Filter) -> Iterator[XMLNodeType]:
+    matches = _compile_filters(filters)
     for node in chain((root,), root._iterate_descendants()):
-        if all(f(node) for f in filters):
+        if matches(node):
             yield node
 
 
 def traverse_df_rtl_btt(root: XMLNodeType, *filters: Filter) -> Iterator[XMLNodeType]:
+    matches = _compile_filters(filters)
     for node in root._iterate_reversed_descendants():
-        if all(f(node) for f in filters):
+        if matches(node):
             yield node
 
 
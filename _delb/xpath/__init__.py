@@ -63,7 +63,7 @@ custom functions.
 
 from __future__ import annotations
 
-from collections.abc import Collection, Iterable, Mapping, Sequence
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
 from functools import lru_cache
 from typing import TYPE_CHECKING, Final, Optional, overload
 
@@ -80,6 +80,7 @@ if TYPE_CHECKING:
     from typing import Any
 
     from _delb.typing import Filter, NamespaceDeclarations
+    from _delb.xpath.ast import CompiledExpression
 
 
 _css_translator: Final = GenericTranslator()
@@ -163,38 +164,62 @@ class QueryResults(Sequence[XMLNodeType]):
         return len(self.__items)
 
 
-# TODO make cachesize configurable via environment variable?
 @lru_cache(maxsize=64)
-def _css_to_xpath(expression: str) -> str:
-    return _css_translator.css_to_xpath(expression, prefix="descendant::")
+def _compile(
+    expression: str, declarations: frozenset[tuple[Optional[str], str]]
+) -> CompiledExpression:
+    # global namespaces are guaranteed by the Namespaces implementation
+    return parse(expression).compile(Namespaces(dict(declarations)))
 
 
-def evaluate(
-    node: XMLNodeType,
-    expression: str,
-    namespaces: Optional[NamespaceDeclarations] = None,
-) -> QueryResults:
-    # global namespaces are guaranteed by the Namespaces implementation
+def _compile_for_node(
+    node: XMLNodeType, expression: str, namespaces: Optional[NamespaceDeclarations]
+) -> CompiledExpression:
+    declarations: frozenset[tuple[Optional[str], str]]
     match namespaces:
         case None:
             if isinstance(node, TagNodeType):
-                _namespaces = Namespaces({"": node.namespace})
+                declarations = frozenset((("", node.namespace),))
             else:
-                _namespaces = Namespaces({})
+                declarations = frozenset()
         case Namespaces():
             # b/c it would break fallback chains
             raise TypeError
         case Mapping():
-            _namespaces = Namespaces(namespaces)
+            declarations = frozenset(namespaces.items())
         case _:
             raise TypeError
 
-    return QueryResults(parse(expression).evaluate(node=node, namespaces=_namespaces))
+    return _compile(expression, declarations)
+
+
+# TODO make cachesize configurable via environment variable?
+@lru_cache(maxsize=64)
+def _css_to_xpath(expression: str) -> str:
+    return _css_translator.css_to_xpath(expression, prefix="descendant::")
+
+
+def evaluate(
+    node: XMLNodeType,
+    expression: str,
+    namespaces: Optional[NamespaceDeclarations] = None,
+) -> QueryResults:
+    return QueryResults(_compile_for_node(node, expression, namespaces)(node))
+
+
+def iterate(
+    node: XMLNodeType,
+    expression: str,
+    namespaces: Optional[NamespaceDeclarations] = None,
+) -> Iterator[XMLNodeType]:
+    # the expression is compiled immediately so that errors are raised here
+    return _compile_for_node(node, expression, namespaces)(node)
 
 
 __all__ = (
     _css_to_xpath.__name__,  # type: ignore
     evaluate.__name__,
+    iterate.__name__,
     parse.__name__,  # type: ignore
     EvaluationContext.__name__,
     QueryResults.__name__,
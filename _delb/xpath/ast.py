@@ -19,9 +19,9 @@ import inspect
 import operator
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable, Iterator, Sequence
-from functools import cached_property, wraps
+from functools import cached_property
 from textwrap import indent
-from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, TypeAlias
 
 
 from _delb.exceptions import InvalidCodePath, XPathEvaluationError, XPathParsingError
@@ -39,6 +39,14 @@ if TYPE_CHECKING:
 xpath_functions: Final = _plugin_manager.xpath_functions
 
 
+# compiled evaluation plans
+
+CompiledNodeTest: TypeAlias = "Callable[[XMLNodeType], bool]"
+CompiledPredicate: TypeAlias = "Callable[[XMLNodeType, int, int], Any]"
+CompiledStep: TypeAlias = "Callable[[Iterable[XMLNodeType]], Iterator[XMLNodeType]]"
+CompiledExpression: TypeAlias = "Callable[[XMLNodeType], Iterator[XMLNodeType]]"
+
+
 # helper
 
 
@@ -95,6 +103,7 @@ class _DocumentNode(_DocumentNodeType):
     iterate_preceding_siblings = _invalid_method
     _iterate_preceding_siblings = _invalid_method
     _iterate_reversed_descendants = _invalid_method
+    iterate_xpath = _invalid_method
     merge_text_nodes = _invalid_method
     prepend_children = _invalid_method
     replace_with = _invalid_method
@@ -149,24 +158,11 @@ class _DocumentNode(_DocumentNodeType):
         raise InvalidCodePath
 
 
-def ensure_prefix(func):
-    @wraps(func)
-    def wrapper(self, node, **kwargs):
-        prefix = self.prefix
-
-        if "context" in kwargs:
-            namespaces = kwargs["context"].namespaces
-        else:
-            namespaces = kwargs["namespaces"]
-
-        if prefix is not None and prefix not in namespaces:
-            raise XPathEvaluationError(
-                f"The namespace prefix `{prefix}` is unknown in the evaluation "
-                "context."
-            )
-        return func(self, node, **kwargs)
-
-    return wrapper
+def validate_prefix(prefix: Optional[str], namespaces: Namespaces):
+    if prefix is not None and prefix not in namespaces:
+        raise XPathEvaluationError(
+            f"The namespace prefix `{prefix}` is unknown in the evaluation context."
+        )
 
 
 def nested_repr(obj: Any) -> str:  # pragma: no cover
@@ -225,20 +221,28 @@ class Node(ABC):
 
 class EvaluationNode(Node):
     @abstractmethod
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> bool:
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        """
+        Returns a function that evaluates the expression for a node, its position and
+        the size of the node set it's contained in.
+        """
         pass
 
     @property
     def _derived_attributes(self):
         raise InvalidCodePath
 
+    def _is_positional(self) -> bool:
+        # whether the evaluation depends on a node's position or the node set's size
+        return False
+
     def _is_unambiguously_locatable(self) -> bool:
         return False
 
 
 class NodeTestNode(Node):
     @abstractmethod
-    def evaluate(self, node: XMLNodeType, namespaces: Namespaces) -> bool:
+    def compile(self, namespaces: Namespaces) -> CompiledNodeTest:
         pass
 
 
@@ -317,7 +321,7 @@ class LocationPath(Node):
     __slots__ = ("absolute", "location_steps", "parent_path")
 
     def __init__(self, location_steps: Iterable[LocationStep], absolute: bool = False):
-        location_steps = tuple(location_steps)
+        location_steps = _fuse_descendant_steps(tuple(location_steps))
         self.parent_path: Final = (
             LocationPath(location_steps=location_steps[:-1], absolute=absolute)
             if len(location_steps) > 1
@@ -329,30 +333,28 @@ class LocationPath(Node):
     def __repr__(self):
         return nested_repr(self)
 
-    def evaluate(
-        self, node: XMLNodeType, namespaces: Namespaces
-    ) -> Iterator[XMLNodeType]:
-        if self.parent_path:
-            yield from self.location_steps[-1].evaluate(
-                node_set=self.parent_path.evaluate(node=node, namespaces=namespaces),
-                namespaces=namespaces,
-            )
+    def compile(self, namespaces: Namespaces) -> CompiledExpression:
+        steps = tuple(s.compile(namespaces) for s in self.location_steps)
+        absolute = self.absolute
 
-        else:
-            node_set: tuple[XMLNodeType,]
-            if self.absolute:
+        def evaluate(node: XMLNodeType) -> Iterator[XMLNodeType]:
+            if absolute:
                 while node._parent is not None:
                     node = node._parent
-                if isinstance(node, _DocumentNodeType):
-                    node_set = (node,)
-                else:
-                    node_set = (_DocumentNode(node),)
-            else:
-                node_set = (node,)
+                if not isinstance(node, _DocumentNodeType):
+                    node = _DocumentNode(node)
 
-            yield from self.location_steps[0].evaluate(
-                node_set=node_set, namespaces=namespaces
-            )
+            node_set: Iterable[XMLNodeType] = (node,)
+            for step in steps:
+                node_set = step(node_set)
+            return iter(node_set)
+
+        return evaluate
+
+    def evaluate(
+        self, node: XMLNodeType, namespaces: Namespaces
+    ) -> Iterator[XMLNodeType]:
+        yield from self.compile(namespaces)(node)
 
     def _is_unambiguously_locatable(self) -> bool:
         return all(s._is_unambiguously_locatable() for s in self.location_steps)
@@ -390,52 +392,100 @@ class LocationStep(Node):
             case _:
                 return self._anders_predicates._derived_attributes
 
-    def evaluate(
-        self, node_set: Iterable[XMLNodeType], namespaces: Namespaces
-    ) -> Iterator[XMLNodeType]:
-        yielded_nodes = set()
-        for node in node_set:
-            for result_node in self._evaluate(node=node, namespaces=namespaces):
-                _id = id(result_node)
-                if _id not in yielded_nodes:
-                    yielded_nodes.add(_id)
-                    yield result_node
-
-    def _evaluate(
-        self, node: XMLNodeType, namespaces: Namespaces
-    ) -> Sequence[XMLNodeType]:
+    def compile(self, namespaces: Namespaces) -> CompiledStep:
+        axis = self.axis.generator
+        node_test = self.node_test.compile(namespaces)
+        select = self._compile_predicates(namespaces)
+        indexed_candidates = (
+            self._compile_index_lookup(namespaces) if self._may_use_name_index else None
+        )
+
+        def evaluate(node_set: Iterable[XMLNodeType]) -> Iterator[XMLNodeType]:
+            yielded_nodes = set()
+            for node in node_set:
+                candidates: Optional[Iterable[XMLNodeType]] = None
+                if indexed_candidates is not None:
+                    candidates = indexed_candidates(node)
+                if candidates is None:
+                    # the axis is consumed lazily so that results can be obtained
+                    # before it's exhausted, unless predicates are positional
+                    candidates = (n for n in axis(node) if node_test(n))
+
+                for result_node in select(candidates):
+                    _id = id(result_node)
+                    if _id not in yielded_nodes:
+                        yielded_nodes.add(_id)
+                        yield result_node
+
+        return evaluate
+
+    def _compile_index_lookup(
+        self, namespaces: Namespaces
+    ) -> Callable[[XMLNodeType], Optional[Sequence[XMLNodeType]]]:
         node_test = self.node_test
-        predicates = self.predicates
+        assert isinstance(node_test, NameMatchTest)
+        validate_prefix(node_test.prefix, namespaces)
+        namespace = node_test._namespace(namespaces)
+        local_name = node_test.local_name
+        include_self = self.axis.generator.__name__ == "descendant_or_self"
+
+        def lookup(node: XMLNodeType) -> Optional[Sequence[XMLNodeType]]:
+            root = node
+            if not isinstance(root, _DocumentNodeType):
+                while (parent := root._parent) is not None:
+                    root = parent
+            # only document nodes of Document instances may hold a name index
+            if (name_index := getattr(root, "_name_index", None)) is None:
+                return None
+
+            return name_index.descendants(
+                node,
+                namespace=namespace,
+                local_name=local_name,
+                include_self=include_self,
+            )
+
+        return lookup
+
+    def _compile_predicates(
+        self, namespaces: Namespaces
+    ) -> Callable[[Iterable[XMLNodeType]], Iterable[XMLNodeType]]:
+        predicates = tuple(p.compile(namespaces) for p in self.predicates)
 
         if not predicates:
-            return tuple(
-                n
-                for n in self.axis.evaluate(node=node, namespaces=namespaces)
-                if node_test.evaluate(node=n, namespaces=namespaces)
-            )
+            return lambda candidates: candidates
+
+        if not any(p._is_positional() for p in self.predicates):
+
+            def select_lazily(
+                candidates: Iterable[XMLNodeType],
+            ) -> Iterator[XMLNodeType]:
+                # the context position and size are irrelevant to these
+                for candidate in candidates:
+                    if all(predicate(candidate, 0, 0) for predicate in predicates):
+                        yield candidate
+
+            return select_lazily
+
+        def select_positionally(
+            candidates: Iterable[XMLNodeType],
+        ) -> list[XMLNodeType]:
+            results = list(candidates)
+            for predicate in predicates:
+                size = len(results)
+                results = [
+                    c
+                    for position, c in enumerate(results, start=1)
+                    if predicate(c, position, size)
+                ]
+            return results
 
-        candidates = [
-            n
-            for n in self.axis.evaluate(node=node, namespaces=namespaces)
-            if node_test.evaluate(node=n, namespaces=namespaces)
-        ]
-        for predicate in predicates:
-            size = len(candidates)
-            next_candidates = []
-            for position, candidate in enumerate(candidates, start=1):
-                if predicate.evaluate(
-                    node=candidate,
-                    context=EvaluationContext(
-                        node=candidate,
-                        position=position,
-                        size=size,
-                        namespaces=namespaces,
-                    ),
-                ):
-                    next_candidates.append(candidate)
-            candidates = next_candidates
-
-        return candidates
+        return select_positionally
+
+    def evaluate(
+        self, node_set: Iterable[XMLNodeType], namespaces: Namespaces
+    ) -> Iterator[XMLNodeType]:
+        yield from self.compile(namespaces)(node_set)
 
     def _is_unambiguously_locatable(self) -> bool:
         if not (
@@ -452,6 +502,42 @@ class LocationStep(Node):
             case _:
                 return self._anders_predicates._is_unambiguously_locatable()
 
+    @cached_property
+    def _may_use_name_index(self) -> bool:
+        return self.axis.generator.__name__ in (
+            "descendant",
+            "descendant_or_self",
+        ) and isinstance(self.node_test, NameMatchTest)
+
+
+def _fuse_descendant_steps(
+    location_steps: tuple[LocationStep, ...],
+) -> tuple[LocationStep, ...]:
+    # the abbreviated `//name` is expanded to `descendant-or-self::node()/child::name`,
+    # which selects the same nodes as `descendant::name` unless it's constrained by
+    # positional predicates. the latter form is cheaper to evaluate and allows the use
+    # of a name index.
+    result: list[LocationStep] = []
+    for step in location_steps:
+        if (
+            result
+            and step.axis.generator.__name__ == "child"
+            and isinstance(step.node_test, NameMatchTest)
+            and not any(p._is_positional() for p in step.predicates)
+            and (previous := result[-1]).axis.generator.__name__ == "descendant_or_self"
+            and isinstance(previous.node_test, NodeTypeTest)
+            and previous.node_test.type is TagNodeType
+            and not previous.predicates
+        ):
+            result[-1] = LocationStep(
+                axis=Axis("descendant"),
+                node_test=step.node_test,
+                predicates=step.predicates,
+            )
+        else:
+            result.append(step)
+    return tuple(result)
+
 
 class XPathExpression(Node):
     # __dict__ is used by the cached_property getter
@@ -463,17 +549,33 @@ class XPathExpression(Node):
     def __repr__(self):
         return nested_repr(self)
 
+    def compile(self, namespaces: Namespaces) -> CompiledExpression:
+        """
+        Returns a function that yields the results of the expression's evaluation with
+        a given context node. Namespace prefixes are resolved once with the given
+        namespaces.
+        """
+        paths = tuple(p.compile(namespaces) for p in self.location_paths)
+
+        if len(paths) == 1:
+            return paths[0]
+
+        def evaluate(node: XMLNodeType) -> Iterator[XMLNodeType]:
+            yielded_nodes: set[int] = set()
+            for path in paths:
+                for result in path(node):
+                    assert not isinstance(result, _DocumentNodeType)
+                    _id = id(result)
+                    if _id not in yielded_nodes:
+                        yielded_nodes.add(_id)
+                        yield result
+
+        return evaluate
+
     def evaluate(
         self, node: XMLNodeType, namespaces: Namespaces
     ) -> Iterator[XMLNodeType]:
-        yielded_nodes: set[int] = set()
-        for path in self.location_paths:
-            for result in path.evaluate(node=node, namespaces=namespaces):
-                assert not isinstance(result, _DocumentNodeType)
-                _id = id(result)
-                if _id not in yielded_nodes:
-                    yielded_nodes.add(_id)
-                    yield result
+        yield from self.compile(namespaces)(node)
 
     @cached_property
     def _is_unambiguously_locatable(self) -> bool:
@@ -492,15 +594,16 @@ class AnyNameTest(NodeTestNode):
     def __init__(self, prefix: Optional[str]):
         self.prefix: Final = prefix
 
-    @ensure_prefix
-    def evaluate(self, node: XMLNodeType, namespaces: Namespaces) -> bool:
-        if not isinstance(node, TagNodeType):
-            return False
+    def compile(self, namespaces: Namespaces) -> CompiledNodeTest:
+        validate_prefix(self.prefix, namespaces)
 
-        if self.prefix:
-            return node.namespace == namespaces[self.prefix]
-        else:
-            return True
+        if not self.prefix:
+            return lambda node: isinstance(node, TagNodeType)
+
+        namespace = namespaces[self.prefix]
+        return lambda node: isinstance(node, TagNodeType) and (
+            node.namespace == namespace
+        )
 
 
 class NameMatchTest(NodeTestNode):
@@ -510,11 +613,18 @@ class NameMatchTest(NodeTestNode):
         self.prefix: Final = prefix
         self.local_name: Final = local_name
 
-    @ensure_prefix
-    def evaluate(self, node: XMLNodeType, namespaces: Namespaces) -> bool:
-        if not isinstance(node, TagNodeType):
-            return False
+    def compile(self, namespaces: Namespaces) -> CompiledNodeTest:
+        validate_prefix(self.prefix, namespaces)
+        namespace = self._namespace(namespaces)
+        local_name = self.local_name
 
+        return lambda node: (
+            isinstance(node, TagNodeType)
+            and node.local_name == local_name
+            and node.namespace == namespace
+        )
+
+    def _namespace(self, namespaces: Namespaces) -> str:
         # this intentionally deviates from the spec, which states that
         # "if the QName does not have a prefix, then the namespace URI is null".
         # instead it refers to the default namespace if such has been declared.
@@ -527,28 +637,14 @@ class NameMatchTest(NodeTestNode):
             if "" in namespaces:  # a default namespace was declared  # noqa: SIM401
                 # delb's capability to address a default namespace
                 # an empty/null namespace is represented as ""
-                namespace = namespaces[""]
+                return namespaces[""]
             else:
                 # XPath spec behaviour
-                # an undefined namespace is represented as None
-                namespace = None
+                # an undefined namespace is equivalent to the empty namespace as
+                # tag nodes represent both as ""
+                return ""
         else:
-            namespace = namespaces[self.prefix]
-
-        match namespace:
-            case None:
-                # XPath spec behaviour
-                if node.namespace:
-                    return False
-            case "":
-                # delb's specific behaviour
-                if node.namespace:
-                    return False
-            case _:
-                if node.namespace != namespace:
-                    return False
-
-        return node.local_name == self.local_name
+            return namespaces[self.prefix]
 
 
 class NodeTypeTest(NodeTestNode):
@@ -557,8 +653,9 @@ class NodeTypeTest(NodeTestNode):
     def __init__(self, type_: type):
         self.type: Final = type_
 
-    def evaluate(self, node: XMLNodeType, namespaces: Namespaces) -> bool:
-        return isinstance(node, (self.type, _DocumentNodeType))
+    def compile(self, namespaces: Namespaces) -> CompiledNodeTest:
+        types = (self.type, _DocumentNodeType)
+        return lambda node: isinstance(node, types)
 
 
 class ProcessingInstructionTest(NodeTypeTest):
@@ -568,11 +665,11 @@ class ProcessingInstructionTest(NodeTypeTest):
         super().__init__(ProcessingInstructionNodeType)
         self.target: Final = target
 
-    def evaluate(self, node: XMLNodeType, namespaces: Namespaces) -> bool:
-        if not super().evaluate(node=node, namespaces=namespaces):
-            return False
-        assert isinstance(node, ProcessingInstructionNodeType)
-        return node.target == self.target
+    def compile(self, namespaces: Namespaces) -> CompiledNodeTest:
+        target = self.target
+        return lambda node: (
+            isinstance(node, ProcessingInstructionNodeType) and node.target == target
+        )
 
 
 # predicate evaluation
@@ -584,8 +681,9 @@ class AnyValue(EvaluationNode):
     def __init__(self, value: Any):
         self.value: Final = value
 
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> Any:
-        return self.value
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        value = self.value
+        return lambda node, position, size: value
 
 
 class AttributeValue(EvaluationNode):
@@ -595,19 +693,20 @@ class AttributeValue(EvaluationNode):
         self.prefix: Final = prefix
         self.local_name: Final = name
 
-    @ensure_prefix
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> Optional[str]:
-        if not isinstance(node, TagNodeType):
-            return None
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        validate_prefix(self.prefix, namespaces)
+        name = (namespaces.get(self.prefix or "", ""), self.local_name)
 
-        if (
-            attribute := node.attributes.get(
-                (context.namespaces.get(self.prefix or "", ""), self.local_name)
-            )
-        ) is None:
-            return ""
-        else:
-            return attribute.value
+        def evaluate(node: XMLNodeType, position: int, size: int) -> Optional[str]:
+            if not isinstance(node, TagNodeType):
+                return None
+
+            if (attribute := node.attributes.get(name)) is None:
+                return ""
+            else:
+                return attribute.value
+
+        return evaluate
 
 
 class BooleanOperator(EvaluationNode):
@@ -644,12 +743,17 @@ class BooleanOperator(EvaluationNode):
 
         raise InvalidCodePath
 
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> Any:
-        return self.operator(
-            self.left.evaluate(node=node, context=context),
-            self.right.evaluate(node=node, context=context),
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        operation = self.operator
+        left = self.left.compile(namespaces)
+        right = self.right.compile(namespaces)
+        return lambda node, position, size: operation(
+            left(node, position, size), right(node, position, size)
         )
 
+    def _is_positional(self) -> bool:
+        return self.left._is_positional() or self.right._is_positional()
+
     def _is_unambiguously_locatable(self) -> bool:
         if self.operator is operator.and_:
             return (
@@ -697,9 +801,26 @@ class Function(EvaluationNode):
             and self.arguments == other.arguments
         )
 
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> Any:
-        return self.function(
-            context, *(x.evaluate(node=node, context=context) for x in self.arguments)
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        function = self.function
+        arguments = tuple(x.compile(namespaces) for x in self.arguments)
+
+        def evaluate(node: XMLNodeType, position: int, size: int) -> Any:
+            return function(
+                EvaluationContext(
+                    node=node, position=position, size=size, namespaces=namespaces
+                ),
+                *(x(node, position, size) for x in arguments),
+            )
+
+        return evaluate
+
+    def _is_positional(self) -> bool:
+        # functions that are provided by plugins may use any context property
+        return (
+            self.function.__module__ != "_delb.xpath.functions"
+            or self.function.__name__ in ("last", "position")
+            or any(x._is_positional() for x in self.arguments)
         )
 
 
@@ -710,15 +831,11 @@ class HasAttribute(EvaluationNode):
         self.prefix: Final = prefix
         self.local_name: Final = local_name
 
-    @ensure_prefix
-    def evaluate(self, node: XMLNodeType, context: EvaluationContext) -> bool:
-        if not isinstance(node, TagNodeType):
-            return False
-        return (
-            node.attributes.get(
-                (context.namespaces.get(self.prefix or "", ""), self.local_name)
-            )
-            is not None
+    def compile(self, namespaces: Namespaces) -> CompiledPredicate:
+        validate_prefix(self.prefix, namespaces)
+        name = (namespaces.get(self.prefix or "", ""), self.local_name)
+        return lambda node, position, size: (
+            isinstance(node, TagNodeType) and node.attributes.get(name) is not None
         )
 
 
@@ -77,7 +77,7 @@ class NormalizeDocument(Transformation):
         for node in self.root.css_select("*[copyOf]"):
             source_id = node.attributes.pop("copyOf", "")
             assert source_id
-            source = document.xpath(f'//*[@xml:id="{source_id[1:]}"]').first
+            source = document.get_by_id(source_id[1:])
             assert isinstance(source, TagNode)
             _copy = source.clone(deep=True)
             _copy.id = None
@@ -91,3 +91,29 @@ def normalize_documents(transformation, document):
 @pytest.mark.parametrize("file", TEI_FILES)
 def test_normalize_documents(benchmark, file):
     benchmark(normalize_documents, NormalizeDocument(), Document(file))
+
+
+def query_names(document):
+    for name in ("persName", "placeName", "date", "lb", "pb", "note", "hi", "p"):
+        document.xpath(f"//{name}")
+
+
+@pytest.mark.parametrize("uses_name_index", (True, False))
+@pytest.mark.parametrize("file", TEI_FILES)
+def test_query_names(benchmark, file, uses_name_index):
+    document = Document(file)
+    document.uses_name_index = uses_name_index
+    benchmark(query_names, document)
+
+
+def walk_following_siblings(node):
+    while (node := node.fetch_following_sibling()) is not None:
+        pass
+
+
+@pytest.mark.parametrize("width", (1_000, 10_000))
+def test_walk_siblings_of_wide_parent(benchmark, width):
+    root = TagNode(
+        "p", children=[TagNode("lb") if i % 2 else "x" for i in range(width)]
+    )
+    benchmark(walk_following_siblings, root.first_child)
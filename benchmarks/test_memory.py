@@ -0,0 +1,42 @@
+import tracemalloc
+
+import memray
+import pytest
+
+from benchmarks.conftest import TEI_FILES, XML_FILES
+from delb import Document, ParserOptions
+
+LARGEST_FILE = max(XML_FILES, key=lambda p: p.stat().st_size)
+
+
+def load_document(file, parser_options=None):
+    return Document(file, parser_options=parser_options)
+
+
+@pytest.mark.parametrize("file", TEI_FILES)
+def test_document_memory(benchmark, file):
+    tracemalloc.start()
+    try:
+        document = load_document(file)
+        benchmark.extra_info["retained memory"] = tracemalloc.get_traced_memory()[0]
+        del document
+    finally:
+        tracemalloc.stop()
+    benchmark(load_document, file)
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_parsing_peak_memory(benchmark, parser, tmp_path):
+    parser_options = ParserOptions(preferred_parsers=parser)
+    load_document("<root/>", parser_options)
+
+    # unlike tracemalloc, memray also tracks the allocations of parser backends
+    trace_file = tmp_path / "trace.bin"
+    with memray.Tracker(trace_file, trace_python_allocators=True):
+        document = load_document(LARGEST_FILE, parser_options)
+    benchmark.extra_info["peak memory"] = memray.FileReader(
+        trace_file
+    ).metadata.peak_memory
+    del document
+
+    benchmark(load_document, LARGEST_FILE, parser_options)
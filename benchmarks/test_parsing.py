@@ -1,22 +1,54 @@
 import pytest
 
-from delb import Document, ParserOptions
+from delb import Document, ParserOptions, load_documents, parse_tree
 
 from benchmarks.conftest import XML_FILES
 
+DTD_DEPENDENT_FILES = {"external_dtd.xml", "serialization-example-input.xml"}
+
 
 def parse_file(file, parser_options):
     Document(file, parser_options)
 
 
 @pytest.mark.parametrize("file", XML_FILES)
-@pytest.mark.parametrize("parser", ("expat", "lxml"))
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
 @pytest.mark.parametrize("all_contents", (True, False))
 def test_parsing_files(benchmark, file, parser, all_contents):
+    if parser == "native" and file.name in DTD_DEPENDENT_FILES:
+        pytest.skip("The parser doesn't support Document Type Declarations.")
     parser_options = ParserOptions(
         load_referenced_resources=True,
         preferred_parsers=parser,
         remove_comments=not all_contents,
         remove_processing_instructions=not all_contents,
     )
+    # allows to relate the timings to the parsing throughput
+    benchmark.extra_info["size"] = file.stat().st_size
     benchmark(parse_file, file, parser_options)
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_parsing_wide_element(benchmark, parser):
+    # a parser adapter's effort per child node must not depend on its position
+    data = "<root>" + 100_000 * "<child/>text" + "</root>"
+    benchmark(parse_tree, data, ParserOptions(preferred_parsers=parser))
+
+
+def load_files_sequentially(files, parser_options):
+    for file in files:
+        Document(file, parser_options)
+
+
+def load_files_in_parallel(files, parser_options, workers):
+    for _ in load_documents(files, parser_options, workers=workers):
+        pass
+
+
+@pytest.mark.parametrize("workers", (None, 2, 4))
+def test_loading_files(benchmark, workers):
+    parser_options = ParserOptions(load_referenced_resources=True)
+    if workers is None:
+        benchmark(load_files_sequentially, XML_FILES, parser_options)
+    else:
+        benchmark(load_files_in_parallel, XML_FILES, parser_options, workers)
@@ -1,6 +1,9 @@
+import pickle
+
 import pytest
 
-from benchmarks.conftest import XML_FILES
+from benchmarks.conftest import TEI_FILES, XML_FILES
+from delb import Document, FormatOptions, ParserOptions, parse_tree
 
 
 def serialize(document):
@@ -9,4 +12,42 @@ def serialize(document):
 
 @pytest.mark.parametrize("file", XML_FILES)
 def test_serialization(benchmark, file):
-    benchmark(serialize, file)
+    benchmark(
+        serialize,
+        Document(file, parser_options=ParserOptions(load_referenced_resources=True)),
+    )
+
+
+@pytest.mark.parametrize(
+    "format_options", (None, FormatOptions(indentation="  ", width=0))
+)
+@pytest.mark.parametrize("with_markup_characters", (False, True))
+def test_serialization_of_text(benchmark, format_options, with_markup_characters):
+    # the escaping of text contents dominates here
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4
+    if with_markup_characters:
+        text += "Sed &amp; &lt;do&gt; eiusmod."
+    root = parse_tree("<root>" + 10_000 * f"<p>{text}</p>" + "</root>")
+    benchmark(root.serialize, format_options=format_options)
+
+
+def serialize_wrapped(document, format_options):
+    document.root.serialize(format_options=format_options)
+
+
+@pytest.mark.parametrize("file", TEI_FILES)
+def test_serialization_with_text_wrapping(benchmark, file):
+    benchmark(
+        serialize_wrapped,
+        Document(file),
+        FormatOptions(align_attributes=False, indentation="  ", width=80),
+    )
+
+
+def pickle_and_restore(document):
+    pickle.loads(pickle.dumps(document))
+
+
+@pytest.mark.parametrize("file", TEI_FILES)
+def test_pickling(benchmark, file):
+    benchmark(pickle_and_restore, Document(file))
@@ -15,15 +15,26 @@
 
 from __future__ import annotations
 
-import warnings
+import asyncio
+import os
 from abc import abstractmethod, ABC
-from collections.abc import Iterator, Sequence
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-from io import TextIOWrapper
+from itertools import islice
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, overload, Any, BinaryIO, Final, Optional
+from typing import (
+    TYPE_CHECKING,
+    overload,
+    Any,
+    BinaryIO,
+    Final,
+    NamedTuple,
+    Optional,
+)
 
-from _delb.builder import parse_nodes, parse_tree, tag
+from _delb.builder import parse_nodes, parse_subtrees, parse_tree, tag
 from _delb.exceptions import (
     FailedDocumentLoading,
     InvalidOperation,
@@ -35,26 +46,37 @@ from _delb.plugins import (
 )
 from _delb.nodes import (
     CommentNode,
+    _decode_nodes,
     _DocumentNode,
+    _encode_nodes,
+    _get_xml_id_index,
+    _indexed_document_nodes,
+    _NameIndex,
     ProcessingInstructionNode,
     TagNode,
 )
 from _delb.parser import ParserOptions
 from _delb.serializer import (
+    DEFAULT_WRITER_BLOCK_SIZE,
     DefaultStringOptions,
     FormatOptions,
     PrettySerializer,
     Serializer,
-    _TextBufferWriter,
+    _BinaryBufferWriter,
     _get_serializer,
+    _iterate_serialization,
 )
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from pathlib import Path
 
+    from httpx import AsyncClient
+
     from _delb.typing import (
         CommentNodeType,
         _DocumentNodeType,
+        _EncodedNode,
         Loader,
         NamespaceDeclarations,
         ProcessingInstructionNodeType,
@@ -252,10 +274,14 @@ class Document(metaclass=DocumentMeta):
     >>> document = Document("<root/>")
     >>> str(document)
     '<?xml version="1.0" encoding="UTF-8"?><root/>'
+
+    Documents are pickled in a compact form that is quicker to restore than to parse
+    the serialized contents. Thus the configuration data of extensions must be
+    picklable too.
     """
 
     _loaders: tuple[Loader, ...]
-    __node: _DocumentNodeType
+    __node: _DocumentNode
 
     __slots__ = ("config", "epilogue", "__node", "prologue", "source_url")
 
@@ -353,14 +379,114 @@ class Document(metaclass=DocumentMeta):
         assert not isinstance(loader_result, str)
         return loader_result
 
+    def _encode(self) -> _EncodedDocument:
+        return _EncodedDocument(
+            klass=self.__class__,
+            config=self.config,
+            source_url=self.source_url,
+            nodes=_encode_nodes(self.__node._child_nodes),
+        )
+
+    @staticmethod
+    def _from_encoded(data: _EncodedDocument) -> Document:
+        # like unpickling, this bypasses the loaders and the class' initialization
+        instance = object.__new__(data.klass)
+        instance.config = data.config
+        instance.source_url = data.source_url
+        instance.__node = _DocumentNode(instance, _decode_nodes(data.nodes))
+        instance.prologue = Prologue(instance.__node)
+        instance.epilogue = Epilogue(instance.__node)
+        return instance
+
     def __contains__(self, node: XMLNodeType) -> bool:
         return node.document is self
 
+    def __reduce__(self):
+        return Document._from_encoded, (self._encode(),)
+
     def __str__(self) -> str:
         serializer = DefaultStringOptions._get_serializer()
         self.__serialize(serializer=serializer, encoding="utf-8")
         return serializer.writer.result
 
+    @classmethod
+    async def aload(
+        cls,
+        url: str,
+        /,
+        parser_options: Optional[ParserOptions] = None,
+        klass: Optional[type[Document]] = None,
+        *,
+        client: Optional[AsyncClient] = None,
+        **config,
+    ) -> Document:
+        """
+        Loads a document from a URL with the ``http`` or ``https`` scheme without
+        blocking the running event loop.  The received chunks are parsed in a worker
+        thread as they arrive.  This requires the ``web-loader`` extra to be installed,
+        see :doc:`/installation`.
+
+        :param url: The document's URL.
+        :param parser_options: A :class:`delb.parser.ParserOptions` instance to
+                               configure the used parser.
+        :param klass: Explicitly define the initialized class.
+        :param client: An :class:`httpx.AsyncClient` to use instead of a new one
+                       with the same configuration as the default client of the
+                       :func:`_delb.plugins.web_loader.web_loader`.
+        :param config: Additional keyword arguments for the configuration of extension
+                       classes.
+        """
+        from _delb.plugins.web_loader import AsyncHttpsStreamWrapper, _async_client
+
+        async with (
+            _async_client(client) as client,
+            client.stream("get", url=url) as response,
+        ):
+            response.raise_for_status()
+            return await asyncio.to_thread(
+                cls,
+                AsyncHttpsStreamWrapper(response, asyncio.get_running_loop()),
+                parser_options=parser_options,
+                klass=klass,
+                source_url=url,
+                **config,
+            )
+
+    @classmethod
+    async def aload_many(
+        cls,
+        urls: Iterable[str],
+        /,
+        parser_options: Optional[ParserOptions] = None,
+        klass: Optional[type[Document]] = None,
+        *,
+        client: Optional[AsyncClient] = None,
+        concurrency: int = 8,
+        **config,
+    ) -> list[Document]:
+        """
+        Loads documents from the given URLs like :meth:`Document.aload` while sharing
+        one client's connection pool.
+
+        :param concurrency: The maximal number of documents that are loaded at once.
+
+        The other arguments are the same as those of :meth:`Document.aload`.  The
+        documents are returned in the order of the URLs.
+        """
+        from _delb.plugins.web_loader import _async_client
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with _async_client(client) as client:
+
+            async def load(url: str) -> Document:
+                async with semaphore:
+                    return await cls.aload(
+                        url, parser_options, klass, client=client, **config
+                    )
+
+            return await asyncio.gather(*(load(url) for url in urls))
+
     def clone(self) -> Document:
         """
         Clones the document with its contents.
@@ -380,6 +506,73 @@ class Document(metaclass=DocumentMeta):
         """
         return self.root.css_select(expression, namespaces=namespaces)
 
+    def get_by_id(self, value: str) -> Optional[TagNodeType]:
+        """
+        Returns the tag node that has the given value assigned as ``xml:id`` attribute
+        or :obj:`None` if there's none.
+
+        The document maintains a mapping of these ids for this purpose, it's built with
+        the first call of this method or the first assignment to
+        :attr:`delb.nodes.TagNode.id` of any of its nodes.
+
+        >>> document = Document('<root><a xml:id="foo"/></root>')
+        >>> document.get_by_id("foo").local_name
+        'a'
+        >>> document.get_by_id("bar") is None
+        True
+        """
+        if (nodes := _get_xml_id_index(self.__node).get(value)) is None:
+            return None
+        return nodes[0]
+
+    def iter_serialize(
+        self,
+        *,
+        chunk_size: int = DEFAULT_WRITER_BLOCK_SIZE,
+        encoding: str = "utf-8",
+        format_options: Optional[FormatOptions] = None,
+        namespaces: Optional[NamespaceDeclarations] = None,
+        newline: None | str = None,
+    ) -> Iterator[bytes]:
+        """
+        Yields the encoded, serialized document contents in chunks while they're
+        produced, e.g. to stream them as response to a web request. The consumed
+        memory doesn't depend on the document's size. The document is only read while
+        the next chunk is awaited, yet it must not be altered before the iteration is
+        completed or abandoned. See :doc:`/api/serialization` for details.
+
+        :param chunk_size: The size of the yielded chunks in bytes, only the last one
+                           may be smaller.
+        :param encoding: The desired text encoding.
+        :param format_options: An instance of :class:`FormatOptions` can be provided to
+                               configure formatting.
+        :param namespaces: A mapping of prefixes to namespaces.  If not provided the
+                           root node's namespace will serve as default namespace.
+                           Prefixes for undeclared namespaces are enumerated with the
+                           prefix ``ns``.
+        :param newline: See :class:`io.TextIOWrapper` for a detailed explanation of the
+                        parameter with the same name.
+        """
+        return _iterate_serialization(
+            lambda serializer: self.__serialize(
+                serializer=serializer, encoding=encoding
+            ),
+            chunk_size=chunk_size,
+            encoding=encoding,
+            format_options=format_options,
+            namespaces=namespaces,
+            newline=newline,
+        )
+
+    def iterate_xpath(
+        self, expression: str, namespaces: Optional[NamespaceDeclarations] = None
+    ) -> Iterator[XMLNodeType]:
+        """
+        This method proxies to the :meth:`delb.nodes.TagNode.iterate_xpath` method of
+        the document's :attr:`root <Document.root>` node.
+        """
+        return self.root.iterate_xpath(expression=expression, namespaces=namespaces)
+
     def merge_text_nodes(self, deep: bool = True):
         """
         This method proxies to the :meth:`delb.nodes.TagNode.merge_text_nodes` method of
@@ -476,7 +669,35 @@ class Document(metaclass=DocumentMeta):
             for node in self.epilogue[:-1]:
                 serializer.writer(str(node) + possible_newline)
             serializer.writer(str(self.epilogue[-1]))
-        serializer.writer.buffer.flush()
+        serializer.writer.flush()
+
+    @property
+    def uses_name_index(self) -> bool:
+        """
+        Whether XPath location steps along the ``descendant`` and
+        ``descendant-or-self`` axes that test for a tag name (as in ``//tei:persName``)
+        look up the matching nodes in an index rather than traversing the tree. The
+        index is built with the first such query and dropped with any alteration of
+        the tree's structure or of tag names. Hence it's beneficial for documents that
+        are queried a lot more often than altered. It's not used by default.
+
+        >>> document = Document("<root><a/><b><a/></b></root>")
+        >>> document.uses_name_index = True
+        >>> document.xpath("//a").size
+        2
+        """
+        return self.__node._name_index is not None
+
+    @uses_name_index.setter
+    def uses_name_index(self, value: bool):
+        if value:
+            if self.__node._name_index is None:
+                self.__node._name_index = _NameIndex(self.__node)
+                _indexed_document_nodes.add(self.__node)
+        else:
+            self.__node._name_index = None
+            if self.__node._xml_ids is None:
+                _indexed_document_nodes.discard(self.__node)
 
     def write(
         self,
@@ -502,19 +723,14 @@ class Document(metaclass=DocumentMeta):
         :param newline: See :class:`io.TextIOWrapper` for a detailed explanation of the
                         parameter with the same name.
         """
-        # TODO figure out what's causing the "unclosed file <_io.TextIOWrapper …>"
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", category=ResourceWarning)
-            self.__serialize(
-                serializer=_get_serializer(
-                    _TextBufferWriter(
-                        TextIOWrapper(buffer), encoding=encoding, newline=newline
-                    ),
-                    format_options=format_options,
-                    namespaces=namespaces,
-                ),
-                encoding=encoding,
-            )
+        self.__serialize(
+            serializer=_get_serializer(
+                _BinaryBufferWriter(buffer, encoding=encoding, newline=newline),
+                format_options=format_options,
+                namespaces=namespaces,
+            ),
+            encoding=encoding,
+        )
 
     def xpath(
         self, expression: str, namespaces: Optional[NamespaceDeclarations] = None
@@ -526,12 +742,114 @@ class Document(metaclass=DocumentMeta):
         return self.root.xpath(expression=expression, namespaces=namespaces)
 
 
+# batch loading
+
+
+class _EncodedDocument(NamedTuple):
+    klass: type[Document]
+    config: SimpleNamespace
+    source_url: Optional[str]
+    nodes: list[_EncodedNode]
+
+
+def _load_document(
+    source: Any,
+    parser_options: Optional[ParserOptions],
+    klass: Optional[type[Document]],
+    config: dict[str, Any],
+) -> Document:
+    try:
+        return Document(source, parser_options=parser_options, klass=klass, **config)
+    except FailedDocumentLoading as e:
+        # the loaders' exceptions aren't necessarily picklable
+        raise FailedDocumentLoading(
+            source,
+            {
+                loader: excuse if isinstance(excuse, str) else repr(excuse)
+                for loader, excuse in e.excuses.items()
+            },
+        ) from None
+
+
+def _load_documents(
+    sources: tuple[Any, ...],
+    parser_options: Optional[ParserOptions],
+    klass: Optional[type[Document]],
+    config: dict[str, Any],
+) -> list[Document]:
+    return [_load_document(s, parser_options, klass, config) for s in sources]
+
+
+def load_documents(
+    sources: Iterable[Any],
+    parser_options: Optional[ParserOptions] = None,
+    *,
+    klass: Optional[type[Document]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1,
+    **config,
+) -> Iterator[Document]:
+    """
+    Loads documents from the given sources in parallel worker processes and yields
+    them in the order of the sources. The documents are passed from the workers in
+    their compact pickled form that is quicker to rebuild than to parse them again.
+
+    :param sources: The sources to load documents from, typically
+                    :class:`pathlib.Path` instances. Anything that :class:`Document`
+                    accepts and that can be pickled is applicable.
+    :param parser_options: The parser options that are used for all documents.
+    :param klass: Explicitly define the initialized class for all documents.
+    :param workers: The number of worker processes, defaults to the number of
+                    processors.
+    :param chunk_size: The number of sources that are passed to a worker at once.
+                       Larger values reduce the communication overhead with many small
+                       documents.
+    :param config: Additional keyword arguments for the configuration of extension
+                   classes.
+
+    The documents' :attr:`Document.config` and :attr:`Document.source_url` are those
+    that were set in the worker processes, hence the configuration data of extensions
+    must be picklable. An exception that occurs in a worker is raised when the
+    according document would be yielded.
+
+    The sources are consumed as the documents are yielded and no more than twice the
+    number of workers times ``chunk_size`` documents are loaded ahead, hence the
+    occupied memory doesn't grow with the number of sources when the documents are
+    consumed slower than they're loaded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    sources = iter(sources)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[Future[list[Document]]] = deque()
+
+    def submit_chunk() -> bool:
+        if not (chunk := tuple(islice(sources, chunk_size))):
+            return False
+        pending.append(
+            executor.submit(_load_documents, chunk, parser_options, klass, config)
+        )
+        return True
+
+    try:
+        while len(pending) < 2 * workers and submit_chunk():
+            pass
+        while pending:
+            documents = pending.popleft().result()
+            submit_chunk()
+            yield from documents
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
 __all__ = (
     DefaultStringOptions.__name__,
     Document.__name__,
     FormatOptions.__name__,
+    load_documents.__name__,
     ParserOptions.__name__,
     parse_nodes.__name__,
+    parse_subtrees.__name__,
     parse_tree.__name__,
     tag.__name__,
 )
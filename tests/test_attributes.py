@@ -215,6 +215,28 @@ def test_detach_sustains_attributes():
     assert node.attributes == attributes_copy
 
 
+def test_escaped_rendition_follows_alterations():
+    root = parse_tree('<root b="&amp;" a="&lt;"/>')
+    assert str(root) == '<root a="&lt;" b="&amp;"/>'
+
+    root.attributes["a"].value = '"'
+    assert str(root) == '<root a="&quot;" b="&amp;"/>'
+
+    root["c"] = ">"
+    assert str(root) == '<root a="&quot;" b="&amp;" c="&gt;"/>'
+
+    del root["b"]
+    assert str(root) == '<root a="&quot;" c="&gt;"/>'
+
+    root.attributes["c"].local_name = "_"
+    assert str(root) == '<root _="&gt;" a="&quot;"/>'
+
+    root.attributes["a"].namespace = "http://a"
+    assert str(root) == '<root xmlns:ns0="http://a" _="&gt;" ns0:a="&quot;"/>'
+
+    assert str(root.clone()) == str(root)
+
+
 def test_namespaced_attributes():
     root = parse_tree('<root xmlns="http://foo.org" b="c"/>')
     for key, attribute in root.attributes.items():
@@ -1,7 +1,10 @@
 import pytest
 
-from delb import parse_tree, tag, ParserOptions
-from delb.exceptions import ParsingValidityError
+from delb import Document, parse_subtrees, parse_tree, tag, ParserOptions
+from delb.names import XML_NAMESPACE
+from delb.exceptions import FailedDocumentLoading, ParsingValidityError
+
+from tests.utils import NOT_WELL_FORMED_ERRORS
 
 
 def test_extra_content():
@@ -16,6 +19,82 @@ def test_invalid_xml_space():
         )
 
 
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_remove_text_outside(parser):
+    data = (
+        "<TEI><teiHeader><title>T</title></teiHeader>"
+        "<text>A<p>b</p>c<text>d</text></text>e</TEI>"
+    )
+
+    root = parse_tree(
+        data, ParserOptions(preferred_parsers=parser, remove_text_outside="text")
+    )
+    assert str(root) == (
+        "<TEI><teiHeader><title/></teiHeader>"
+        "<text>A<p>b</p>c<text>d</text></text></TEI>"
+    )
+
+    root = parse_tree(
+        data,
+        ParserOptions(
+            preferred_parsers=parser,
+            remove_text_outside=lambda d: d.local_name in ("p", "title"),
+        ),
+    )
+    assert root.full_text == "Tb"
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_skip_subtrees(parser):
+    data = (
+        '<TEI xmlns="https://tei"><teiHeader><title>T</title></teiHeader>'
+        "<text><p><teiHeader/></p><note>n</note>x</text></TEI>"
+    )
+
+    root = parse_tree(
+        data,
+        ParserOptions(preferred_parsers=parser, skip_subtrees="{https://tei}teiHeader"),
+    )
+    assert (
+        str(root) == '<TEI xmlns="https://tei"><text><p/><note>n</note>x</text></TEI>'
+    )
+
+    root = parse_tree(
+        data,
+        ParserOptions(
+            preferred_parsers=parser,
+            remove_text_outside="{https://tei}note",
+            skip_subtrees=("{https://tei}teiHeader", "{https://tei}p"),
+        ),
+    )
+    assert str(root) == '<TEI xmlns="https://tei"><text><note>n</note></text></TEI>'
+
+    root = parse_tree(
+        "<a>x <b>q</b> y<b/>z</a>",
+        ParserOptions(preferred_parsers=parser, skip_subtrees="b"),
+    )
+    assert [n.content for n in root.iterate_children()] == ["x  yz"]
+
+    with pytest.raises(ParsingValidityError, match="no root element"):
+        tuple(
+            parse_subtrees(
+                data,
+                "{https://tei}title",
+                ParserOptions(preferred_parsers=parser, skip_subtrees=lambda d: True),
+            )
+        )
+    with pytest.raises(ParsingValidityError, match="no root element"):
+        parse_tree(
+            "<!-- x --><a><b/></a>",
+            ParserOptions(preferred_parsers=parser, skip_subtrees="a"),
+        )
+    with pytest.raises(FailedDocumentLoading, match="no root element"):
+        Document(
+            "<a/>",
+            parser_options=ParserOptions(preferred_parsers=parser, skip_subtrees="a"),
+        )
+
+
 def test_tag_with_invalid_args():
     with pytest.raises(TypeError):
         tag("a", (0,))
@@ -25,3 +104,73 @@ def test_tag_with_invalid_args():
         tag()
     with pytest.raises(ValueError, match=r"Unrecognized arguments\."):
         tag("a", {}, (), ())
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_parse_subtrees(parser):
+    data = (
+        '<corpus xmlns="https://corpus"><!-- a comment -->'
+        '<TEI xml:id="a"><text>'
+        "<p>A <hi>highlighted</hi> text.</p><TEI/></text></TEI>"
+        "<header><TEI_no/></header>"
+        '<TEI xml:id="b"><text xml:space="preserve"> <p/> </text></TEI>'
+        "</corpus>"
+    )
+    options = ParserOptions(preferred_parsers=parser, reduce_whitespace=True)
+
+    results = tuple(parse_subtrees(data, "{https://corpus}TEI", options))
+    assert len(results) == 2
+    for node in results:
+        assert node.parent is None
+        assert node.local_name == "TEI"
+    assert results[0].id == "a"
+    assert results[0].first_child[0].full_text == "A highlighted text."
+    assert results[0].first_child[1].local_name == "TEI"
+    assert results[1].first_child.full_text == "  "
+
+    assert not tuple(parse_subtrees(data, "TEI", options))
+
+    results = tuple(
+        parse_subtrees(
+            data,
+            lambda n: n.attributes.get((XML_NAMESPACE, "id")) == "b",
+            options,
+        )
+    )
+    assert len(results) == 1
+    assert results[0].id == "b"
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_parse_subtrees_xml_ids_outside_matches(parser):
+    options = ParserOptions(preferred_parsers=parser)
+
+    for data in (
+        '<c><x xml:id="a"/><TEI xml:id="a"/></c>',
+        '<c><TEI xml:id="a"/><x xml:id="a"/></c>',
+    ):
+        if parser == "lxml":
+            # libxml2 validates the uniqueness across the whole input
+            with pytest.raises(NOT_WELL_FORMED_ERRORS[parser], match="ID a already"):
+                tuple(parse_subtrees(data, "TEI", options))
+            continue
+        results = tuple(parse_subtrees(data, "TEI", options))
+        assert len(results) == 1
+        assert results[0].id == "a"
+
+    with pytest.raises(ParsingValidityError, match="Redundantly used xml:id: a"):
+        tuple(parse_subtrees('<c><TEI xml:id="a"><x xml:id="a"/></TEI></c>', "TEI"))
+
+
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
+def test_parse_subtrees_is_streaming(parser):
+    subtrees = parse_subtrees(
+        "<root><x><a/></x><y/><x><b/></x><z>",
+        lambda n: n.local_name == "x",
+        ParserOptions(preferred_parsers=parser),
+    )
+    assert next(subtrees).first_child.local_name == "a"
+    assert next(subtrees).first_child.local_name == "b"
+    # the unclosed tag at the end is only detected now
+    with pytest.raises(NOT_WELL_FORMED_ERRORS[parser]):
+        next(subtrees)
@@ -1,4 +1,5 @@
 import gc
+import pickle
 from typing import Final
 
 import pytest
@@ -9,9 +10,11 @@ from delb import (
     DocumentMixinBase,
     ProcessingInstructionNode,
     parse_tree,
+    tag,
 )
 from delb.exceptions import FailedDocumentLoading, InvalidOperation
 from delb.filters import altered_default_filters, is_tag_node
+from delb.names import XML_NAMESPACE
 from delb.nodes import TagNode, TextNode
 from delb.utils import get_traverser
 
@@ -130,6 +133,81 @@ def test_explicitly_passed_source_url():
     assert document.source_url == "https://root.io/"
 
 
+def test_get_by_id():
+    document = Document('<root><a xml:id="a"/><b><c xml:id="c"/></b></root>')
+    a = document.root[0]
+    b = document.root[1]
+    c = b[0]
+    assert document.get_by_id("a") is a
+    assert document.get_by_id("c") is c
+    assert document.get_by_id("x") is None
+
+    b.detach()
+    assert document.get_by_id("c") is None
+    document.root.append_children(b)
+    assert document.get_by_id("c") is c
+
+    with pytest.raises(ValueError, match="already assigned"):
+        c.id = "a"
+    c.id = "x"
+    assert document.get_by_id("c") is None
+    assert document.get_by_id("x") is c
+
+    c.attributes[(XML_NAMESPACE, "id")].value = "y"
+    assert document.get_by_id("x") is None
+    assert document.get_by_id("y") is c
+
+    del a.attributes[(XML_NAMESPACE, "id")]
+    assert document.get_by_id("a") is None
+    c.replace_with(tag("c", {(XML_NAMESPACE, "id"): "a"}))
+    assert document.get_by_id("y") is None
+    assert document.get_by_id("a") is b[0]
+
+
+def test_get_by_id_with_duplicates():
+    document = Document('<root><a xml:id="x"/></root>')
+    assert document.get_by_id("x") is (a := document.root[0])
+
+    document.root.append_children(a.clone(deep=True))
+    a.detach()
+    assert document.get_by_id("x") is document.root[0]
+    assert document.xpath('//*[@xml:id="x"]').first is document.root[0]
+
+    document.root.append_children(a)
+    assert document.get_by_id("x") is document.root[0]
+    document.root[0].attributes[(XML_NAMESPACE, "id")].value = "y"
+    assert document.get_by_id("x") is a
+    assert document.get_by_id("y") is document.root[0]
+
+
+def test_get_by_id_maintains_the_index():
+    document = Document(
+        "<root>" + "".join(f'<a xml:id="a{i}"/>' for i in range(8)) + "</root>"
+    )
+    assert document.get_by_id("a0") is document.root[0]
+    # the index is updated in place and never rebuilt
+    index = document.root._parent._xml_ids
+
+    for i, node in enumerate(tuple(document.root.iterate_children())):
+        node.id = f"b{i}"
+        assert document.get_by_id(f"a{i}") is None
+        assert document.get_by_id(f"b{i}") is node
+
+    node = document.root[3].detach()
+    assert document.get_by_id("b3") is None
+    assert document.get_by_id("b4") is document.root[3]
+    node.id = "c"
+    document.root.prepend_children(node)
+    assert document.get_by_id("c") is node
+
+    document.root[1].attributes[(XML_NAMESPACE, "id")] = "b1"
+    assert document.get_by_id("b0") is None
+    document.root[2].detach()
+    assert document.get_by_id("b1") is document.root[1]
+
+    assert document.root._parent._xml_ids is index
+
+
 def test_invalid_document():
     with pytest.raises(FailedDocumentLoading):
         Document(0)
@@ -162,6 +240,20 @@ def test_mixin_method():
     assert document.playground_method() == "f00"
 
 
+def test_pickle(files_path):
+    document = Document(
+        files_path / "marx_manifestws_1848.TEI-P5.xml", playground_property="foo"
+    )
+    document.epilogue.append(CommentNode("c"))
+
+    restored = pickle.loads(pickle.dumps(document))
+    assert str(restored) == str(document)
+    assert restored.source_url == document.source_url
+    assert restored.config.playground.property == "foo"
+    assert restored.root.document is restored
+    assert restored.epilogue[0].content == "c"
+
+
 def test_prologue():
     document = Document("<!--c--><root/>")
 
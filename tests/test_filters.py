@@ -38,6 +38,31 @@ def test_extended_default_filters():
     assert len(default_filters[-1]) == 1
 
 
+def test_filter_chains():
+    def has_a_attribute(node):
+        return isinstance(node, TagNode) and "a" in node.attributes
+
+    def has_b_attribute(node):
+        return isinstance(node, TagNode) and "b" in node.attributes
+
+    root = parse_tree('<root><x a=""/>t<x b=""/><!--c--><x a="" b=""/></root>')
+
+    with altered_default_filters():
+        assert len(root) == 5
+        assert len(tuple(root.iterate_children(has_a_attribute))) == 2
+        assert len(tuple(root.iterate_children(has_a_attribute, has_b_attribute))) == 1
+
+    assert len(root) == 4
+    assert len(tuple(root.iterate_children(has_a_attribute))) == 2
+    assert len(tuple(root.iterate_children(has_a_attribute, has_b_attribute))) == 1
+    assert root.last_child.index == 3
+
+    with altered_default_filters(has_b_attribute, extend=True):
+        assert len(root) == 2
+        assert root.last_child.index == 1
+        assert len(tuple(root.iterate_children(has_a_attribute))) == 1
+
+
 def test_is_pi_node():
     document = Document("<root/><?a b?><!--c--><?d e?>")
     with altered_default_filters():
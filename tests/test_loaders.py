@@ -1,10 +1,13 @@
+import asyncio
 from pathlib import Path
 
+import httpx
 import pytest
 from pytest_httpx import IteratorStream
 
-from delb import Document, TagNode, parse_tree
+from delb import Document, TagNode, load_documents, parse_tree
 from delb.exceptions import FailedDocumentLoading
+from _delb.plugins.web_loader import AsyncHttpsStreamWrapper
 
 from tests.utils import chdir
 
@@ -15,6 +18,88 @@ TEST_CONTENTS = TEST_FILE.read_text()
 TEST_FILE_URI = f"file://{TEST_FILE}"
 
 
+def test_aload(httpx_mock):
+    httpx_mock.add_response(
+        stream=IteratorStream(
+            (
+                TEST_CONTENTS[i : i + 4096].encode()
+                for i in range(0, len(TEST_CONTENTS), 4096)
+            )
+        )
+    )
+    url = "https://bdk.london/das_manifest.xml"
+    document = asyncio.run(Document.aload(url, playground_property="foo"))
+    assert document.root.local_name == "TEI"
+    assert document.source_url == url
+    assert document.config.playground.property == "foo"
+    assert str(document) == str(Document(TEST_FILE))
+
+    httpx_mock.add_response(status_code=404)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(Document.aload(url))
+
+
+def test_aload_reads_received_chunks(httpx_mock, monkeypatch):
+    chunks = tuple(
+        TEST_CONTENTS[i : i + 4096].encode() for i in range(0, len(TEST_CONTENTS), 4096)
+    )
+    httpx_mock.add_response(stream=IteratorStream(chunks))
+
+    reads = []
+    received_chunks = 0
+    read = AsyncHttpsStreamWrapper.read
+    receive_chunk = AsyncHttpsStreamWrapper._receive_chunk
+
+    def counting_read(self, size=-1):
+        reads.append(result := read(self, size))
+        return result
+
+    def counting_receive_chunk(self):
+        nonlocal received_chunks
+        received_chunks += 1
+        return receive_chunk(self)
+
+    monkeypatch.setattr(AsyncHttpsStreamWrapper, "read", counting_read)
+    monkeypatch.setattr(
+        AsyncHttpsStreamWrapper, "_receive_chunk", counting_receive_chunk
+    )
+
+    document = asyncio.run(Document.aload("https://bdk.london/das_manifest.xml"))
+    assert str(document) == str(Document(TEST_FILE))
+    # each received chunk is passed on whole, only the encoding detection reads less
+    assert received_chunks == len(chunks) + 1
+    assert len(reads) == len(chunks) + 2
+    assert len(reads[0]) == 64
+    assert b"".join(reads[1:]) == b"".join(chunks)[64:]
+    assert reads[-1] == b""
+
+
+@pytest.mark.httpx_mock(can_send_already_matched_responses=True)
+def test_aload_many(httpx_mock):
+    active_requests = 0
+    max_active_requests = 0
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        nonlocal active_requests, max_active_requests
+        active_requests += 1
+        max_active_requests = max(active_requests, max_active_requests)
+        await asyncio.sleep(0.01)
+        active_requests -= 1
+        return httpx.Response(
+            200,
+            text='<?xml version="1.0" encoding="UTF-8"?>'
+            f"<doc n='{request.url.path[1:]}'/>",
+        )
+
+    httpx_mock.add_callback(respond)
+
+    urls = [f"http://localhost/{i}" for i in range(12)]
+    documents = asyncio.run(Document.aload_many(urls, concurrency=3))
+    assert [d.root["n"] for d in documents] == [str(i) for i in range(12)]
+    assert [d.source_url for d in documents] == urls
+    assert max_active_requests == 3
+
+
 def test_buffer_loader():
     with TEST_FILE.open("rb") as f:
         document = Document(f)
@@ -41,6 +126,38 @@ def test_web_loader(httpx_mock, s):
     assert document.source_url == url
 
 
+def test_load_documents():
+    sources = (TEST_FILE, "<!-- prologue --><root><a/>b</root>")
+    documents = tuple(load_documents(sources, workers=2, playground_property="foo"))
+
+    for source, document in zip(sources, documents):
+        expected = Document(source)
+        assert str(document) == str(expected)
+        assert document.source_url == expected.source_url
+        assert document.config.playground.property == "foo"
+        assert document.root.document is document
+    assert len(documents[1].prologue) == 1
+
+    with pytest.raises(FailedDocumentLoading):
+        tuple(load_documents((TEST_FILE, "<root>"), workers=1))
+
+
+def test_load_documents_consumes_sources_gradually():
+    consumed_sources = 0
+
+    def sources():
+        nonlocal consumed_sources
+        for i in range(100):
+            consumed_sources += 1
+            yield f"<root n='{i}'/>"
+
+    documents = load_documents(sources(), workers=1)
+    assert next(documents).root["n"] == "0"
+    # two chunks were submitted ahead, a third one after a result was obtained
+    assert consumed_sources == 3
+    assert [d.root["n"] for d in documents] == [str(i) for i in range(1, 100)]
+
+
 def test_path_loader():
     document = Document(TEST_FILE)
     assert document.source_url == TEST_FILE_URI
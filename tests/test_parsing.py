@@ -1,3 +1,5 @@
+from io import BytesIO
+
 import pytest
 from lxml import etree
 from urllib.error import HTTPError
@@ -15,13 +17,16 @@ from delb.exceptions import (
     ParsingValidityError,
     ParsingProcessingError,
 )
+from _delb.parser import EventType, parse_events
 from _delb.plugins import plugin_manager
 from _delb.plugins.core_loaders import path_loader
 
 from tests.conftest import FILES_PATH, XML_FILES
-from tests.utils import assert_equal_trees
+from tests.utils import NOT_WELL_FORMED_ERRORS, assert_equal_trees
+
+DTD_DEPENDENT_FILES = {"external_dtd.xml", "serialization-example-input.xml"}
 
-assert len(AVAILABLE_PARSERS := tuple(plugin_manager.parsers)) == 2
+assert len(AVAILABLE_PARSERS := tuple(plugin_manager.parsers)) == 4
 
 pytestmark = pytest.mark.parametrize("parser", AVAILABLE_PARSERS)
 
@@ -30,6 +35,11 @@ c = CommentNode
 t = TagNode
 
 
+def skip_without_dtd_support(parser):
+    if parser == "native":
+        pytest.skip("The parser doesn't support Document Type Declarations.")
+
+
 def test_attributes(parser):
     root = parse_tree(
         """<root xmlns="http://fo.org" a="b"/>""",
@@ -38,14 +48,63 @@ def test_attributes(parser):
     assert ("http://fo.org", "a") in root.attributes
 
 
+def test_interned_names(parser):
+    root = parse_tree(
+        '<root xmlns="http://fo.org"><a x:b="1" xmlns:x="http://x"/><a x:b="2" '
+        'xmlns:x="http://x"/></root>',
+        ParserOptions(preferred_parsers=parser),
+    )
+    a_1, a_2 = root
+    assert a_1.local_name is a_2.local_name
+    assert a_1.namespace is a_2.namespace is root.namespace
+    assert next(iter(a_1.attributes)) is next(iter(a_2.attributes))
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 2**16))
+def test_chunked_input(chunk_size, parser):
+    source = "<root>" + '<a b="ä€">𝄞 &amp; ö</a>x' * 64 + "</root>"
+    expected = parse_tree(source, ParserOptions(preferred_parsers=parser))
+    options = ParserOptions(chunk_size=chunk_size, preferred_parsers=parser)
+
+    assert_equal_trees(parse_tree(source, options), expected)
+    assert_equal_trees(
+        parse_tree(
+            BytesIO(f'<?xml version="1.0" encoding="UTF-8"?>{source}'.encode()),
+            options,
+        ),
+        expected,
+    )
+
+
+@pytest.mark.parametrize("data", ("", BytesIO()))
+def test_empty_input(data, parser):
+    with pytest.raises(NOT_WELL_FORMED_ERRORS[parser]):
+        parse_tree(data, ParserOptions(chunk_size=1, preferred_parsers=parser))
+
+
 @pytest.mark.parametrize(
     ("unplugged", "exception"),
     (
-        (True, {"expat": ParsingProcessingError, "lxml": etree.XMLSyntaxError}),
-        (False, {"expat": HTTPError, "lxml": etree.XMLSyntaxError}),
+        (
+            True,
+            {
+                "expat": ParsingProcessingError,
+                "lxml": etree.XMLSyntaxError,
+                "pyexpat": ParsingProcessingError,
+            },
+        ),
+        (
+            False,
+            {
+                "expat": HTTPError,
+                "lxml": etree.XMLSyntaxError,
+                "pyexpat": HTTPError,
+            },
+        ),
     ),
 )
 def test_dtd_from_web(parser, unplugged, exception):
+    skip_without_dtd_support(parser)
     try:
         Document(
             FILES_PATH / "web_dtd.ignored_xml",
@@ -61,6 +120,24 @@ def test_dtd_from_web(parser, unplugged, exception):
         raise AssertionError("No exception raised.")
 
 
+def test_document_type_declaration(parser):
+    options = ParserOptions(preferred_parsers=parser)
+    root = parse_tree(
+        """\
+        <!DOCTYPE root [
+          <!ELEMENT root (#PCDATA)>
+          <!ATTLIST root a CDATA "]>">
+        ]>
+        <root>&amp;</root>""",
+        options,
+    )
+    assert root.full_text == "&"
+
+    if parser == "native":
+        with pytest.raises(ParsingProcessingError):
+            parse_tree("<!DOCTYPE root [<!ENTITY a 'b'>]><root>&a;</root>", options)
+
+
 @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
 @pytest.mark.parametrize("load_referenced_resources", (True, False))
 def test_external_entity_declaration(
@@ -68,6 +145,7 @@ def test_external_entity_declaration(
     load_referenced_resources,
     parser,
 ):
+    skip_without_dtd_support(parser)
     try:
         document = Document(
             files_path / "external_dtd.xml",
@@ -159,6 +237,8 @@ def test_parse_tree(in_, out, as_bytes, parser):
 @pytest.mark.parametrize("reduced_content", (True, False))
 @pytest.mark.parametrize("file", XML_FILES)
 def test_parse_xml_documents(file, parser, reduced_content):
+    if file.name in DTD_DEPENDENT_FILES:
+        skip_without_dtd_support(parser)
     Document(
         file,
         parser_options=ParserOptions(
@@ -171,16 +251,75 @@ def test_parse_xml_documents(file, parser, reduced_content):
     )
 
 
-def test_redundant_xml_ids(parser):
-    exception = {"expat": ParsingValidityError, "lxml": etree.XMLSyntaxError}[parser]
+@pytest.mark.parametrize(
+    "data",
+    (
+        "",
+        "<root>",
+        "<root></toor>",
+        "<root/><root/>",
+        "<root/>text",
+        "text<root/>",
+        "<root a='1' a='2'/>",
+        "<root xmlns:x='x' xmlns:y='x' x:a='1' y:a='2'/>",
+        "<root a='<'/>",
+        "<root>&undeclared;</root>",
+        "<root>&#0;</root>",
+        "<root>& </root>",
+        "<root>]]></root>",
+        "<root><!-- -- --></root>",
+        "<root><?xml version='1.0'?></root>",
+        "<x:root/>",
+        "<root xmlns:x=''/>",
+        "<root xmlns:xmlns='x'/>",
+        "<root>\x01</root>",
+        "<1root/>",
+        " <?xml version='1.0'?><root/>",
+    ),
+)
+def test_not_well_formed_input(data, parser):
+    if parser == "lxml" and data == "<x:root/>":
+        # lxml only records an undeclared prefix as error, the tag's name is then
+        # rejected when it is processed by the adapter
+        exception = ValueError
+    else:
+        exception = NOT_WELL_FORMED_ERRORS[parser]
+
     with pytest.raises(exception):
+        parse_tree(data, ParserOptions(preferred_parsers=parser))
+
+
+def test_redundant_xml_ids(parser):
+    with pytest.raises(ParsingValidityError):
         parse_tree(
             "<root xml:id='a'><node xml:id='a'/></root>",
             options=ParserOptions(preferred_parsers=parser),
         )
 
 
+@pytest.mark.parametrize("chunk_size", (0, -1))
+def test_invalid_chunk_size(chunk_size, parser):
+    options = ParserOptions(chunk_size=chunk_size, preferred_parsers=parser)
+    for data in ("<root/>", b"<root/>"):
+        with pytest.raises(ValueError, match="chunk_size parser option must be"):
+            parse_tree(data, options)
+
+
+def test_streamed_events(parser):
+    stream = BytesIO(
+        b'<?xml version="1.0" encoding="UTF-8"?><root>' + b"<a/>" * 2**14 + b"</root>"
+    )
+    events = parse_events(
+        stream, ParserOptions(chunk_size=256, preferred_parsers=parser), None
+    )
+    assert next(events)[0] is EventType.TagStart
+    assert stream.tell() < 1024
+    assert sum(1 for _ in events) == 2 * 2**14 + 1
+
+
 def test_safety(parser):
+    skip_without_dtd_support(parser)
+
     # these are taken from Christian Heimes' test suite for the defused-xml project.
     # there's no expectation with regards to the resulting contents, it must be solely
     # ensured that nothing blows up.
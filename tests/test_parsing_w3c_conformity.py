@@ -111,6 +111,16 @@ IGNORED_TESTS = {
         "utf16b",
         "weekly-*",
     },
+    # documents with Document Type Declarations are skipped, see below
+    "native": set(),
+    "pyexpat": {
+        # dealing with elaborated DTDs isn't a project goal. these cases use invalid
+        # ones, yet the document itself is parseable.
+        "ibm-invalid-P68-ibm68i0?.xml",
+        "ibm-not-wf-P69-ibm69n05.xml",
+        # the entity resolver is never called
+        "uri01",
+    },
 }
 
 
@@ -140,6 +150,14 @@ class W3CTestProcess(Process):
             assert self.case.type.endswith("valid")
 
 
+def declares_document_type(path: Path) -> bool:
+    data = path.read_bytes()
+    return any(
+        "<!DOCTYPE".encode(encoding) in data
+        for encoding in ("utf-8", "utf-16-be", "utf-16-le")
+    )
+
+
 def collect_w3c_conformance_tests():
     suite_path = Path(__file__).parent / "w3c_conformance_test_suite_20020606"
     cases_path: Path | None = None
@@ -192,6 +210,9 @@ def collect_w3c_conformance_tests():
 
 @pytest.mark.parametrize("case", collect_w3c_conformance_tests())
 def test_w3c_test_suite(case):
+    if case.parser == "native" and declares_document_type(case.path):
+        pytest.skip("The parser doesn't support Document Type Declarations.")
+
     # invalid documents and encoding problems may crash the application or evoke side
     # effects on other tests. hence they're executed in a subprocess.
     test = W3CTestProcess(case)
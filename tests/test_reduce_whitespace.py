@@ -13,7 +13,7 @@ from tests.utils import assert_equal_trees
 TEI_NAMESPACE: Final = "http://www.tei-c.org/ns/1.0"
 
 
-@pytest.mark.parametrize("parser", ("expat", "lxml"))
+@pytest.mark.parametrize("parser", ("expat", "lxml", "native", "pyexpat"))
 @pytest.mark.parametrize(
     "sample",
     ("<a><b/> <c/> </a>",),
@@ -1,9 +1,19 @@
+import gzip
+import threading
+import tracemalloc
+from io import BytesIO
 from textwrap import dedent
 from typing import Final
 
 import pytest
 
-from _delb.serializer import Serializer
+from _delb.nodes import _namespace_usages
+from _delb.serializer import (
+    Serializer,
+    _BinaryBufferWriter,
+    _get_serializer,
+    _StringWriter,
+)
 from delb import DefaultStringOptions, Document, FormatOptions, parse_tree, tag
 from delb.nodes import CommentNode, ProcessingInstructionNode, TagNode, TextNode
 from delb.parser import ParserOptions
@@ -125,6 +135,92 @@ def test_indentation(indentation, in_, out):
     assert serialisat == dedent(out)
 
 
+@pytest.mark.parametrize(
+    "format_options",
+    (None, FormatOptions(align_attributes=False, indentation="  ", width=40)),
+)
+def test_iter_serialize(files_path, format_options):
+    document = Document(files_path / "marx_manifestws_1848.TEI-P5.xml")
+    buffer = BytesIO()
+    document.write(buffer, encoding="utf-16", format_options=format_options)
+
+    chunks = list(
+        document.iter_serialize(
+            chunk_size=1_000, encoding="utf-16", format_options=format_options
+        )
+    )
+    assert b"".join(chunks) == buffer.getvalue()
+    assert all(len(c) == 1_000 for c in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 1_000
+
+    root = document.root
+    assert (
+        b"".join(root.iter_serialize(format_options=format_options, newline=""))
+        == root.serialize(format_options=format_options, newline="").encode()
+    )
+
+    threads_count = threading.active_count()
+    chunks = root.iter_serialize(chunk_size=10)
+    assert next(chunks) == b"<TEI xmlns"
+    chunks.close()
+    assert threading.active_count() == threads_count
+    # the whole output fits in one chunk, so the producer has passed it all when the
+    # iteration is closed
+    chunks = root.iter_serialize(chunk_size=2**24)
+    assert next(chunks).startswith(b"<TEI xmlns")
+    chunks.close()
+    assert threading.active_count() == threads_count
+
+    # the arguments are validated before the iteration
+    with pytest.raises(ValueError, match=r"Invalid indentation characters\."):
+        root.iter_serialize(format_options=FormatOptions(indentation="X"))
+    with pytest.raises(ValueError, match="chunk size"):
+        document.iter_serialize(chunk_size=0)
+    with pytest.raises(LookupError):
+        root.iter_serialize(encoding="utf-0")
+    assert threading.active_count() == threads_count
+
+
+def test_iter_serialize_with_wrapped_lines(monkeypatch):
+    format_options = FormatOptions(align_attributes=False, indentation="  ", width=60)
+
+    def make_tree(paragraphs: int) -> TagNode:
+        return parse_tree(
+            "<root>"
+            + "<p>Lorem <hi>ipsum</hi> dolor sit amet, consectetur.</p>" * paragraphs
+            + "</root>"
+        )
+
+    def serialize_in_chunks(root: TagNode) -> list[bytes]:
+        return list(
+            root.iter_serialize(
+                chunk_size=1_000, format_options=format_options, newline=""
+            )
+        )
+
+    def peak_memory(root: TagNode) -> int:
+        tracemalloc.start()
+        chunks = serialize_in_chunks(root)
+        result = tracemalloc.get_traced_memory()[1] - sum(len(c) for c in chunks)
+        tracemalloc.stop()
+        return result
+
+    root = make_tree(200)
+    chunks = serialize_in_chunks(root)
+    assert b"".join(chunks) == (
+        root.serialize(format_options=format_options, newline="").encode()
+    )
+    assert all(len(c) == 1_000 for c in chunks[:-1])
+
+    # the memo of measured lengths doesn't grow with the tree
+    monkeypatch.setattr("_delb.serializer._MEASUREMENTS_CACHE_SIZE", 2**8)
+    assert peak_memory(make_tree(2_000)) < 1.5 * peak_memory(make_tree(500))
+
+    # and its contents are merely an optimization
+    monkeypatch.setattr("_delb.serializer._MEASUREMENTS_CACHE_SIZE", 2)
+    assert serialize_in_chunks(root) == chunks
+
+
 @pytest.mark.parametrize(
     ("in_", "namespaces", "prefixes"),
     (
@@ -165,6 +261,51 @@ def test_prefix_collection_and_generation(in_, namespaces, prefixes):
     assert serializer._prefixes == prefixes
 
 
+def test_prefixes_after_alterations():
+    root = parse_tree('<root xmlns="http://a"><b/></root>')
+    assert str(root) == '<root xmlns="http://a"><b/></root>'
+
+    b = root[0]
+    b.namespace = "http://b"
+    assert str(root) == '<root xmlns="http://a" xmlns:ns0="http://b"><ns0:b/></root>'
+
+    b.attributes[("http://c", "x")] = "y"
+    assert str(root) == (
+        '<root xmlns="http://a" xmlns:ns0="http://b" xmlns:ns1="http://c">'
+        '<ns0:b ns1:x="y"/></root>'
+    )
+
+    b.detach()
+    assert str(root) == '<root xmlns="http://a"/>'
+
+    root.append_children(tag("c", {("http://d", "x"): ""}))
+    assert (
+        str(root) == '<root xmlns="http://a" xmlns:ns0="http://d"><c ns0:x=""/></root>'
+    )
+
+
+def test_namespace_usages_are_invalidated_per_tree():
+    root = parse_tree('<root xmlns="http://a"><b x=""/></root>')
+    other_root = parse_tree("<root/>")
+    assert root in _namespace_usages
+    assert other_root in _namespace_usages
+
+    b = root[0]
+    b.attributes["x"] = "y"
+    b.append_children("text")
+    assert root in _namespace_usages
+
+    tag_node = TagNode("c")
+    tag_node.append_children(TagNode("d", namespace="http://c"))
+    other_root.append_children(TagNode("c"))
+    assert root in _namespace_usages
+    assert other_root not in _namespace_usages
+
+    b.append_children(tag_node)
+    assert root not in _namespace_usages
+    assert root._get_used_namespaces() == ("http://a", "", "http://c")
+
+
 @pytest.mark.parametrize(
     ("format_options", "out"),
     (
@@ -243,6 +384,9 @@ def test_significant_whitespace_is_saved(result_file, format_options, out):
         ({}, TagNode("n", {"x": "<"}), """<n x="&lt;"/>"""),
         ({}, TagNode("n", {"x": '"'}), """<n x="&quot;"/>"""),
         ({}, TagNode("n", {"x": '"&"'}), r"""<n x="&quot;&amp;&quot;"/>"""),
+        ({}, TagNode("n", {"x": "&lt;"}), """<n x="&amp;lt;"/>"""),
+        ({}, parse_tree("<n>&lt;&amp;\"'&gt;</n>"), """<n>&lt;&amp;"'&gt;</n>"""),
+        ({}, parse_tree("<n>&amp;gt;</n>"), "<n>&amp;gt;</n>"),
         (
             {"": "http://namespace"},
             TagNode("node", {("http://namespace", "bar"): "x"}),
@@ -681,3 +825,50 @@ def test_xml_space(width, out):
     DefaultStringOptions.format_options = None
     root = parse_tree('<root xml:space="default"><t/></root>')
     assert str(root) == '<root xml:space="default"><t/></root>'
+
+
+def test_write_to_binary_streams(files_path):
+    document = Document(files_path / "marx_manifestws_1848.TEI-P5.xml")
+
+    buffer = BytesIO()
+    document.write(buffer, encoding="utf-32", newline="")
+    assert buffer.getvalue().decode("utf-32") == str(document).replace(
+        "UTF-8", "UTF-32", 1
+    )
+
+    format_options = FormatOptions(align_attributes=False, indentation="  ", width=40)
+    DefaultStringOptions.format_options = format_options
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as file:
+        document.write(
+            file, encoding="utf-16", format_options=format_options, newline="\r\n"
+        )
+    assert gzip.decompress(buffer.getvalue()).decode("utf-16") == str(document).replace(
+        "UTF-8", "UTF-16", 1
+    ).replace("\n", "\r\n")
+
+
+@pytest.mark.parametrize(
+    "format_options",
+    (
+        None,
+        FormatOptions(align_attributes=True, indentation="  ", width=0),
+        FormatOptions(align_attributes=False, indentation="  ", width=40),
+    ),
+)
+def test_writer_block_sizes(files_path, format_options):
+    root = Document(files_path / "marx_manifestws_1848.TEI-P5.xml").root
+
+    def serialize(writer):
+        serializer = _get_serializer(writer, format_options, None)
+        serializer.serialize_root(root)
+        serializer.writer.flush()
+        return serializer.writer
+
+    expected = serialize(_StringWriter()).result
+    assert serialize(_StringWriter(block_size=1)).result == expected
+    assert serialize(_StringWriter(block_size=1_000)).result == expected
+
+    buffer = BytesIO()
+    serialize(_BinaryBufferWriter(buffer, newline="", block_size=1_000))
+    assert buffer.getvalue().decode() == expected
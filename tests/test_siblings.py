@@ -1,6 +1,6 @@
 import pytest
 
-from delb.nodes import Siblings, TextNode
+from delb.nodes import Siblings, TagNode, TextNode
 
 
 def test_index():
@@ -18,3 +18,45 @@ def test_invalid_sibling_type():
     siblings = Siblings(None, ())
     with pytest.raises(TypeError):
         siblings.append(0)
+
+
+def test_index_after_alterations():
+    root = TagNode("root", children=[TagNode(f"n{i}") for i in range(8)])
+    siblings = root._child_nodes
+
+    def assert_consistent_indexes():
+        for i, node in enumerate(tuple(siblings)):
+            assert siblings.index(node) == i
+        for i, node in reversed(tuple(enumerate(siblings))):
+            assert siblings.index(node) == i
+
+    assert_consistent_indexes()
+
+    root[3].detach()
+    root.insert_children(0, TagNode("a"))
+    root.insert_children(-2, TagNode("b"))
+    root[5].add_following_siblings(TagNode("c"))
+    assert siblings.index(root[-1]) == 9
+    root.append_children(TagNode("d"))
+    assert_consistent_indexes()
+
+    node = root[4]
+    node.detach()
+    with pytest.raises(IndexError):
+        siblings.index(node)
+    other = TagNode("other", children=[node])
+    assert other._child_nodes.index(node) == 0
+    assert_consistent_indexes()
+
+    assert [n.local_name for n in root.iterate_children()] == [
+        "a",
+        "n0",
+        "n1",
+        "n2",
+        "n5",
+        "c",
+        "b",
+        "n6",
+        "n7",
+        "d",
+    ]
@@ -1,3 +1,4 @@
+import pickle
 from copy import copy, deepcopy
 from typing import Final
 
@@ -11,6 +12,7 @@ from delb.nodes import CommentNode, TagNode, TextNode
 
 from tests.conftest import XML_FILES
 from tests.utils import (
+    assert_equal_trees,
     assert_nodes_are_in_document_order,
     skip_long_running_test,
     variety_forest,
@@ -582,6 +584,30 @@ def test_no_siblings_on_root_without_document():
         root.add_preceding_siblings(CommentNode("sibling"))
 
 
+def test_pickle():
+    with altered_default_filters():
+        root = parse_tree(
+            '<r xmlns="http://r" xmlns:x="http://x"><a x:b="c" d="e">f<?g h?></a>'
+            "<x:i><!--j--><k/></x:i>l</r>"
+        )
+        for node in (root, root[0], root[0][1], root[1][0], root[2]):
+            restored = pickle.loads(pickle.dumps(node))
+            assert restored is not node
+            assert restored.parent is None
+            assert_equal_trees(restored, node)
+
+    restored = pickle.loads(pickle.dumps(root))
+    restored[0]["d"] = "f"
+    assert restored[0]["d"] == "f"
+    assert root[0]["d"] == "e"
+
+    node = deep = TagNode("deep")
+    for _ in range(10_000):
+        node = node.append_children(tag("deep"))[0]
+    restored = pickle.loads(pickle.dumps(deep))
+    assert len(tuple(restored.iterate_descendants())) == 10_000
+
+
 def test_prepend_children():
     root = parse_tree("<root><b/></root>")
     result = root.prepend_children(tag("a"))
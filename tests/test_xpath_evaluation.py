@@ -1,8 +1,9 @@
 import pytest
 
-from _delb.xpath import evaluate
+from _delb.xpath import evaluate, parse
 from _delb.xpath.ast import Axis
 from delb import parse_tree, Document
+from delb.exceptions import XPathEvaluationError
 from delb.filters import altered_default_filters, is_tag_node
 from delb.names import Namespaces
 from delb.nodes import TagNode, TextNode
@@ -83,6 +84,17 @@ def test_attribute_value_test(namespaces):
     start.xpath("self::text()[@foo='bar']")
 
 
+def test_compiled_expression():
+    root = parse_tree("<root><a><b x='1'/></a><a><b x='2'/><b x='1'/></a></root>")
+    evaluate_ = parse("b[@x='1']").compile(Namespaces({}))
+    assert [len(tuple(evaluate_(node))) for node in root] == [1, 1]
+
+    with pytest.raises(XPathEvaluationError):
+        parse("p:b").compile(Namespaces({}))
+    with pytest.raises(XPathEvaluationError):
+        root.xpath("p:b[@p:x]")
+
+
 def test_contributed_function_concat():
     root = parse_tree("<root><a foo='bar'/></root>")
     assert root.xpath("*[@foo=concat('b','a', 'r')]").size == 1
@@ -146,6 +158,117 @@ def test_multiple_predicates():
     assert result.first["x"] == "3"
 
 
+def test_name_index():
+    document = Document(
+        "<root xmlns:x='http://x'><a/><b><a n='1'/><x:a/><c><a n='1'/></c></b></root>"
+    )
+    document.uses_name_index = True
+    b = document.root[1]
+
+    def assert_results(expression, node=None, namespaces=None):
+        if node is None:
+            node = document.root
+        document.uses_name_index = False
+        expected = node.xpath(expression, namespaces).in_document_order()
+        document.uses_name_index = True
+        assert node.xpath(expression, namespaces).as_tuple == expected.as_tuple
+
+    for expression in ("//a", "//a[@n='1']", "//a[2]", "descendant::a", "//c"):
+        assert_results(expression)
+    assert_results(".//a", node=b)
+    assert_results("descendant-or-self::b", node=b)
+    assert_results("//y:a", namespaces={"y": "http://x"})
+
+    b.append_children(b.clone(deep=True))
+    assert_results("//a")
+    b[1].local_name = "c"
+    assert_results("//c")
+    b[0].detach()
+    assert_results("//a")
+
+    with pytest.raises(XPathEvaluationError):
+        document.xpath("//y:a")
+
+
+@pytest.mark.parametrize(
+    ("path", "expression", "equivalent", "fused"),
+    (
+        # the equivalents' steps along the descendant-or-self axis test for any tag
+        # name and are therefore not fused with their following child step
+        ((), "//a", "/descendant-or-self::*/child::a", True),
+        ((), "//a[@n]", "/descendant-or-self::*/a[@n]", True),
+        (
+            (),
+            "//a[contains(@m, 'x')]",
+            "/descendant-or-self::*/a[contains(@m, 'x')]",
+            True,
+        ),
+        ((), "//a[last()]", "/descendant-or-self::*/a[last()]", False),
+        ((), "//a[@n='1']", "/descendant-or-self::*/a[@n='1']", True),
+        (
+            (),
+            "//a[@n='1' and @m='x']",
+            "/descendant-or-self::*/a[@n='1' and @m='x']",
+            True,
+        ),
+        ((), "//a[2]", "/descendant-or-self::*/a[2]", False),
+        ((), "//a//a", "/descendant-or-self::*/a/descendant-or-self::*/a", True),
+        (
+            (),
+            "//b//a[@n='1']",
+            "/descendant-or-self::*/b/descendant-or-self::*/a[@n='1']",
+            True,
+        ),
+        ((), "//y:a[@y:n='1']", "/descendant-or-self::*/y:a[@y:n='1']", True),
+        ((0,), ".//a", "descendant-or-self::*/a", True),
+        ((0,), ".//a[@n='1']", "descendant-or-self::*/a[@n='1']", True),
+        ((1,), "b//a", "b/descendant-or-self::*/a", True),
+    ),
+)
+def test_name_index_and_unfused_steps(path, expression, equivalent, fused):
+    document = Document(
+        "<root xmlns:x='http://x'>"
+        "<a n='1' m='x'><a><a n='1' m='x'><a/></a></a><x:a n='1'/></a>"
+        "<a n='2'><b><a n='1'/><c><a n='2' m='x'><a n='1' m='x'/></a></c></b></a>"
+        "</root>"
+    )
+    node = document.root
+    for index in path:
+        node = node[index]
+    namespaces = {"y": "http://x"}
+
+    axes = [
+        s.axis.generator.__name__
+        for s in parse(expression).location_paths[0].location_steps
+    ]
+    assert ("descendant_or_self" not in axes) is fused
+
+    expected = node.xpath(equivalent, namespaces).in_document_order().as_tuple
+    assert expected
+
+    for uses_name_index in (False, True):
+        document.uses_name_index = uses_name_index
+        results = node.xpath(expression, namespaces)
+        assert results.in_document_order().as_tuple == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ("//a", "/descendant-or-self::node()/a", "//a[@m='x']", "//a[@n]"),
+)
+def test_fused_descendant_steps_results_order(expression):
+    document = Document(
+        "<root><a n='1' m='x'><a n='2' m='x'/></a><b><a n='3' m='x'/></b>"
+        "<a n='4' m='x'/></root>"
+    )
+    for uses_name_index in (False, True):
+        document.uses_name_index = uses_name_index
+        results = document.xpath(expression)
+        # the results are in document order rather than grouped by the context nodes
+        assert [n["n"] for n in results] == ["1", "2", "3", "4"]
+        assert results.last["n"] == "4"
+
+
 def test_processing_instruction():
     document = Document("""\
         <root>
@@ -2,7 +2,7 @@ from typing import Final
 
 import pytest
 
-from delb import Document
+from delb import Document, TagNode, parse_tree
 
 from tests.utils import assert_nodes_are_in_document_order
 
@@ -62,5 +62,43 @@ def test_first_and_last(queries_sample):
     assert queries_sample.css_select("note").last is None
 
 
+@pytest.mark.parametrize(
+    "expression", ("//node", "//node[@foo]", "node | //*", "descendant::*[1]")
+)
+def test_iterated_results(expression, queries_sample):
+    expected = queries_sample.xpath(expression).as_tuple
+    assert tuple(queries_sample.iterate_xpath(expression)) == expected
+
+    results = queries_sample.iterate_xpath(expression)
+    if expected:
+        assert next(results) is expected[0]
+    assert tuple(results) == expected[1:]
+
+
+@pytest.mark.parametrize(
+    "expression", ("descendant::p", "descendant::p[@n]", "descendant::*[@n]")
+)
+def test_iterated_results_are_lazy(expression, monkeypatch):
+    root = parse_tree('<root><p n="1"/><div><p n="2"/></div></root>')
+
+    traversed_nodes = []
+    iterate_descendants = TagNode._iterate_descendants
+
+    def recording_iterate_descendants(self):
+        for node in iterate_descendants(self):
+            traversed_nodes.append(node)
+            yield node
+
+    monkeypatch.setattr(TagNode, "_iterate_descendants", recording_iterate_descendants)
+
+    results = root.iterate_xpath(expression)
+    assert next(results) is root[0]
+    # the tree is only traversed as far as the results were consumed
+    assert traversed_nodes == [root[0]]
+
+    assert tuple(results) == (root[1][0],)
+    assert traversed_nodes == [root[0], root[1], root[1][0]]
+
+
 def test_size(queries_sample):
     assert queries_sample.css_select("node").size == 4
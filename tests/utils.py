@@ -1,9 +1,14 @@
 import os
 import sys
 from itertools import pairwise, product
+from typing import Final
+from xml.parsers.expat import ExpatError
+from xml.sax import SAXParseException
 
 import pytest
+from lxml import etree
 
+from delb.exceptions import ParsingValidityError
 from delb.filters import altered_default_filters
 from delb.nodes import TagNode
 from delb.typing import XMLNodeType  # noqa: TC001
@@ -24,6 +29,15 @@ else:
     from contextlib import chdir  # noqa: F401
 
 
+# the exceptions that the parser adapters raise for input that isn't well-formed
+NOT_WELL_FORMED_ERRORS: Final = {
+    "expat": SAXParseException,
+    "lxml": etree.XMLSyntaxError,
+    "native": ParsingValidityError,
+    "pyexpat": ExpatError,
+}
+
+
 @altered_default_filters()
 def assert_equal_trees(a: XMLNodeType, b: XMLNodeType):
     result = compare_trees(a, b)